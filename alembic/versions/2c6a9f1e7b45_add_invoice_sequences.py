@@ -0,0 +1,58 @@
+"""add per-company invoice number sequences
+
+Revision ID: 2c6a9f1e7b45
+Revises: 8e5b07c3d1a9
+Create Date: 2026-02-17 14:08:55.471302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c6a9f1e7b45'
+down_revision: Union[str, Sequence[str], None] = '8e5b07c3d1a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'invoice_sequences',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('prefix', sa.String(length=20), nullable=False),
+        sa.Column('next_value', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('company_id')
+    )
+    op.create_index(op.f('ix_invoice_sequences_id'), 'invoice_sequences', ['id'], unique=False)
+
+    # Numbers were allocated from one global counter; continue each company after its highest suffix
+    op.execute("""
+        INSERT INTO invoice_sequences (company_id, prefix, next_value, created_at, updated_at)
+        SELECT companies.id, 'INV-',
+               COALESCE(MAX(CAST(substring(invoices.invoice_number from '([0-9]+)$') AS INTEGER)), 0) + 1,
+               now(), now()
+        FROM companies
+        LEFT JOIN invoices ON invoices.company_id = companies.id
+        GROUP BY companies.id
+    """)
+
+    # Numbers are now unique per company rather than globally
+    op.execute("ALTER TABLE invoices DROP CONSTRAINT IF EXISTS invoices_invoice_number_key")
+    op.create_unique_constraint('uq_invoices_company_id_invoice_number', 'invoices', ['company_id', 'invoice_number'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_invoices_company_id_invoice_number', 'invoices', type_='unique')
+    op.create_unique_constraint('invoices_invoice_number_key', 'invoices', ['invoice_number'])
+    op.drop_index(op.f('ix_invoice_sequences_id'), table_name='invoice_sequences')
+    op.drop_table('invoice_sequences')
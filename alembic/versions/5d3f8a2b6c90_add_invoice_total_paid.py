@@ -0,0 +1,33 @@
+"""add invoice total_paid
+
+Revision ID: 5d3f8a2b6c90
+Revises: 2c6a9f1e7b45
+Create Date: 2026-02-24 10:15:37.920144
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d3f8a2b6c90'
+down_revision: Union[str, Sequence[str], None] = '2c6a9f1e7b45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('invoices', sa.Column('total_paid', sa.Numeric(precision=10, scale=2), server_default='0', nullable=False))
+    op.execute("""
+        UPDATE invoices SET total_paid = paid.amount
+        FROM (SELECT invoice_id, SUM(amount) AS amount FROM payments GROUP BY invoice_id) AS paid
+        WHERE paid.invoice_id = invoices.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('invoices', 'total_paid')
@@ -0,0 +1,44 @@
+"""add keyset pagination indexes
+
+Revision ID: 6b1d8e4fa2c7
+Revises: a3e7c2d91f04
+Create Date: 2026-01-14 16:02:53.118420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b1d8e4fa2c7'
+down_revision: Union[str, Sequence[str], None] = 'a3e7c2d91f04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+KEYSET_TABLES = ('clients', 'quotes', 'invoices')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Pages seek on (created_at, id): a NULL created_at can't be encoded in a cursor
+    # and never compares below one, so backfill it and keep it set from here on
+    for table in KEYSET_TABLES:
+        op.execute(f"UPDATE {table} SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL")
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), nullable=False)
+
+    op.create_index('ix_clients_company_id_created_at_id', 'clients', ['company_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_quotes_company_id_created_at_id', 'quotes', ['company_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_invoices_company_id_created_at_id', 'invoices', ['company_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_invoices_company_id_created_at_id', table_name='invoices')
+    op.drop_index('ix_quotes_company_id_created_at_id', table_name='quotes')
+    op.drop_index('ix_clients_company_id_created_at_id', table_name='clients')
+
+    for table in KEYSET_TABLES:
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), nullable=True)
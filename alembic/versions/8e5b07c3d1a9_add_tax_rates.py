@@ -0,0 +1,31 @@
+"""add company and quote tax rates
+
+Revision ID: 8e5b07c3d1a9
+Revises: d4f2a9c8e731
+Create Date: 2026-02-10 09:41:12.306217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e5b07c3d1a9'
+down_revision: Union[str, Sequence[str], None] = 'd4f2a9c8e731'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Every existing quote was taxed at the previously hardcoded 10%
+    op.add_column('companies', sa.Column('tax_rate', sa.Numeric(precision=5, scale=4), server_default='0.1000', nullable=False))
+    op.add_column('quotes', sa.Column('tax_rate', sa.Numeric(precision=5, scale=4), server_default='0.1000', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('quotes', 'tax_rate')
+    op.drop_column('companies', 'tax_rate')
@@ -0,0 +1,85 @@
+"""add companies and denormalized company_id tenant key
+
+Revision ID: a3e7c2d91f04
+Revises: 4cd58e0b2230
+Create Date: 2026-01-12 09:41:17.201834
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e7c2d91f04'
+down_revision: Union[str, Sequence[str], None] = '4cd58e0b2230'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TENANT_TABLES = ['users', 'clients', 'quotes', 'invoices', 'payments']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 1. Companies table, one row per distinct users.company_name
+    op.create_table(
+        'companies',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_companies_id'), 'companies', ['id'], unique=False)
+    op.execute("INSERT INTO companies (name, created_at, updated_at) SELECT DISTINCT company_name, now(), now() FROM users")
+
+    # 2. Add company_id as nullable first
+    for table in TENANT_TABLES:
+        op.add_column(table, sa.Column('company_id', sa.Integer(), nullable=True))
+
+    # 3. Backfill down the ownership chain
+    op.execute("UPDATE users SET company_id = companies.id FROM companies WHERE companies.name = users.company_name")
+    op.execute("UPDATE clients SET company_id = users.company_id FROM users WHERE users.id = clients.user_id")
+    op.execute("UPDATE quotes SET company_id = clients.company_id FROM clients WHERE clients.id = quotes.client_id")
+    op.execute("UPDATE invoices SET company_id = quotes.company_id FROM quotes WHERE quotes.id = invoices.quote_id")
+    op.execute("UPDATE payments SET company_id = invoices.company_id FROM invoices WHERE invoices.id = payments.invoice_id")
+
+    # 4. Enforce and constrain
+    for table in TENANT_TABLES:
+        op.alter_column(table, 'company_id', existing_type=sa.Integer(), nullable=False)
+        op.create_foreign_key(f'{table}_company_id_fkey', table, 'companies', ['company_id'], ['id'])
+
+    # 5. Indexes: plain FK indexes plus composite tenant indexes
+    op.create_index(op.f('ix_users_company_id'), 'users', ['company_id'], unique=False)
+    op.create_index(op.f('ix_clients_user_id'), 'clients', ['user_id'], unique=False)
+    op.create_index(op.f('ix_quotes_client_id'), 'quotes', ['client_id'], unique=False)
+    op.create_index(op.f('ix_payments_invoice_id'), 'payments', ['invoice_id'], unique=False)
+    op.create_index(op.f('ix_line_items_quote_id'), 'line_items', ['quote_id'], unique=False)
+    op.create_index('ix_clients_company_id_email', 'clients', ['company_id', 'email'], unique=False)
+    op.create_index('ix_quotes_company_id_status', 'quotes', ['company_id', 'status'], unique=False)
+    op.create_index('ix_invoices_company_id_status_due_date', 'invoices', ['company_id', 'status', 'due_date'], unique=False)
+    op.create_index('ix_invoices_company_id_due_date', 'invoices', ['company_id', 'due_date'], unique=False)
+    op.create_index('ix_payments_company_id_paid_at', 'payments', ['company_id', 'paid_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_payments_company_id_paid_at', table_name='payments')
+    op.drop_index('ix_invoices_company_id_due_date', table_name='invoices')
+    op.drop_index('ix_invoices_company_id_status_due_date', table_name='invoices')
+    op.drop_index('ix_quotes_company_id_status', table_name='quotes')
+    op.drop_index('ix_clients_company_id_email', table_name='clients')
+    op.drop_index(op.f('ix_line_items_quote_id'), table_name='line_items')
+    op.drop_index(op.f('ix_payments_invoice_id'), table_name='payments')
+    op.drop_index(op.f('ix_quotes_client_id'), table_name='quotes')
+    op.drop_index(op.f('ix_clients_user_id'), table_name='clients')
+    op.drop_index(op.f('ix_users_company_id'), table_name='users')
+
+    for table in reversed(TENANT_TABLES):
+        op.drop_constraint(f'{table}_company_id_fkey', table, type_='foreignkey')
+        op.drop_column(table, 'company_id')
+
+    op.drop_index(op.f('ix_companies_id'), table_name='companies')
+    op.drop_table('companies')
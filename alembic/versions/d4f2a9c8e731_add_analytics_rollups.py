@@ -0,0 +1,95 @@
+"""add analytics rollup tables
+
+Revision ID: d4f2a9c8e731
+Revises: 6b1d8e4fa2c7
+Create Date: 2026-02-03 11:27:40.582913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f2a9c8e731'
+down_revision: Union[str, Sequence[str], None] = '6b1d8e4fa2c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'revenue_daily',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('total', sa.Numeric(14, 2), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('company_id', 'day', name='uq_revenue_daily_company_id_day')
+    )
+    op.create_index(op.f('ix_revenue_daily_id'), 'revenue_daily', ['id'], unique=False)
+
+    op.create_table(
+        'revenue_by_client',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('client_id', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Numeric(14, 2), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id']),
+        sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('company_id', 'client_id', name='uq_revenue_by_client_company_id_client_id')
+    )
+    op.create_index(op.f('ix_revenue_by_client_id'), 'revenue_by_client', ['id'], unique=False)
+
+    op.create_table(
+        'invoice_due_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('outstanding', sa.Numeric(14, 2), nullable=False),
+        sa.Column('open_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('company_id', 'due_date', name='uq_invoice_due_rollups_company_id_due_date')
+    )
+    op.create_index(op.f('ix_invoice_due_rollups_id'), 'invoice_due_rollups', ['id'], unique=False)
+
+    # Backfill from existing history (same aggregates as `python -m services.rollups`)
+    op.execute("""
+        INSERT INTO revenue_daily (company_id, day, total, created_at, updated_at)
+        SELECT company_id, paid_at::date, SUM(amount), now(), now()
+        FROM payments GROUP BY company_id, paid_at::date
+    """)
+    op.execute("""
+        INSERT INTO revenue_by_client (company_id, client_id, total, created_at, updated_at)
+        SELECT payments.company_id, quotes.client_id, SUM(payments.amount), now(), now()
+        FROM payments
+        JOIN invoices ON invoices.id = payments.invoice_id
+        JOIN quotes ON quotes.id = invoices.quote_id
+        GROUP BY payments.company_id, quotes.client_id
+    """)
+    op.execute("""
+        INSERT INTO invoice_due_rollups (company_id, due_date, outstanding, open_count, created_at, updated_at)
+        SELECT company_id, due_date, SUM(balance_due), SUM(CASE WHEN balance_due > 0 THEN 1 ELSE 0 END), now(), now()
+        FROM invoices GROUP BY company_id, due_date
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_invoice_due_rollups_id'), table_name='invoice_due_rollups')
+    op.drop_table('invoice_due_rollups')
+    op.drop_index(op.f('ix_revenue_by_client_id'), table_name='revenue_by_client')
+    op.drop_table('revenue_by_client')
+    op.drop_index(op.f('ix_revenue_daily_id'), table_name='revenue_daily')
+    op.drop_table('revenue_daily')
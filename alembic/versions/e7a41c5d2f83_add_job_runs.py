@@ -0,0 +1,47 @@
+"""add job runs
+
+Revision ID: e7a41c5d2f83
+Revises: 5d3f8a2b6c90
+Create Date: 2026-03-03 08:52:19.664031
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a41c5d2f83'
+down_revision: Union[str, Sequence[str], None] = '5d3f8a2b6c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'job_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job', sa.String(length=100), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('duration_ms', sa.Integer(), nullable=True),
+        sa.Column('rows_updated', sa.Integer(), nullable=False),
+        sa.Column('companies', sa.Integer(), nullable=False),
+        sa.Column('batches', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_runs_id'), 'job_runs', ['id'], unique=False)
+    op.create_index(op.f('ix_job_runs_job'), 'job_runs', ['job'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_runs_job'), table_name='job_runs')
+    op.drop_index(op.f('ix_job_runs_id'), table_name='job_runs')
+    op.drop_table('job_runs')
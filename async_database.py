@@ -0,0 +1,53 @@
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from utils import slow_queries
+from utils.instrumentation import instrument_engine
+from config.environment import (
+    db_URI, db_replica_URI, async_db_URI, db_pool_size, db_max_overflow, db_pool_timeout,
+    db_pool_recycle, db_pool_pre_ping, db_statement_timeout_ms, db_application_name, slow_query_log_enabled
+)
+
+
+def to_async_url(url: str) -> str:
+    """Point a sync PostgreSQL URL at the asyncpg driver."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+def _instrument(engine):
+    instrument_engine(engine.sync_engine)
+    if slow_query_log_enabled:
+        slow_queries.attach(engine.sync_engine)
+    return engine
+
+
+def create_async_db_engine(url: str):
+    if url.startswith("sqlite"):
+        return _instrument(create_async_engine(url, pool_pre_ping=db_pool_pre_ping))
+
+    server_settings = {"application_name": db_application_name}
+    if db_statement_timeout_ms:
+        server_settings["statement_timeout"] = str(db_statement_timeout_ms)
+
+    engine = create_async_engine(
+        url,
+        pool_size=db_pool_size,
+        max_overflow=db_max_overflow,
+        pool_timeout=db_pool_timeout,
+        pool_recycle=db_pool_recycle,
+        pool_pre_ping=db_pool_pre_ping,
+        connect_args={"server_settings": server_settings}
+    )
+    return _instrument(engine)
+
+
+# The async stack only serves read endpoints, so prefer the replica when there is one
+async_engine = create_async_db_engine(async_db_URI or to_async_url(db_replica_URI or db_URI))
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,87 @@
+"""
+Cost of building a 10k-quote list response.
+
+Compares the previous path (ORM entities with selectinload, validated through
+Page[QuoteResponse] with from_attributes and dumped by Pydantic, as FastAPI
+does for a response_model) against services.list_rows (column tuples, plain
+dicts, utils.json_response). Runs against a temporary SQLite database filled
+by benchmarks.dataset, or DATABASE_URL if it is set and already loaded.
+Run from the repo root:
+
+    python -m benchmarks.bench_list_serialization [--quotes 10000] [--line-items 5] [--repeat 5]
+"""
+import argparse
+import os
+import tempfile
+import timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quotes", type=int, default=10000)
+    parser.add_argument("--line-items", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Settings are read at import time
+    generate = "DATABASE_URL" not in os.environ
+    if generate:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='inflow-bench-'), 'bench.db')}"
+    os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+    from pydantic import TypeAdapter
+    from sqlalchemy import select
+    from benchmarks import dataset
+    from database import SessionLocal, engine
+    from models.base import Base
+    from models.quote import Quote
+    from serializers.pagination import Page
+    from serializers.quote import QuoteResponse
+    from controllers.quotes import QUOTE_RESPONSE_OPTIONS
+    from services import list_rows
+    from utils import json_response
+
+    db = SessionLocal()
+    if generate:
+        Base.metadata.create_all(bind=engine)
+        clients = max(args.quotes // 100, 1)
+        dataset.generate(db, dataset.DatasetSpec(companies=1, clients=clients, quotes=args.quotes // clients, line_items=args.line_items, payments=0))
+    company_id = db.scalar(select(Quote.company_id).group_by(Quote.company_id).order_by(Quote.company_id).limit(1))
+    adapter = TypeAdapter(Page[QuoteResponse])
+
+    def orm_rows():
+        return db.query(Quote).options(*QUOTE_RESPONSE_OPTIONS).filter(Quote.company_id == company_id).order_by(Quote.created_at.desc(), Quote.id.desc()).all()
+
+    def orm_serialize(quotes):
+        return adapter.dump_json(adapter.validate_python({"items": quotes, "next_cursor": None}, from_attributes=True))
+
+    def tuple_rows():
+        rows = db.execute(list_rows.quote_list_statement(company_id).order_by(Quote.created_at.desc(), Quote.id.desc())).all()
+        return rows, db.execute(list_rows.line_items_statement([row.id for row in rows])).all()
+
+    def tuple_serialize(fetched):
+        return json_response.dumps({"items": list_rows.quote_rows(*fetched), "next_cursor": None})
+
+    def orm_end_to_end():
+        db.expunge_all()
+        return orm_serialize(orm_rows())
+
+    quotes = orm_rows()
+    fetched = tuple_rows()
+    same = orm_serialize(quotes) == tuple_serialize(fetched)
+    print(f"{len(quotes)} quotes, {len(fetched[1])} line items, identical JSON: {same}, orjson: {json_response.orjson is not None}")
+
+    timings = (
+        ("response_model (ORM)", lambda: orm_serialize(quotes), orm_end_to_end),
+        ("list_rows", lambda: tuple_serialize(fetched), lambda: tuple_serialize(tuple_rows())),
+    )
+    print(f"{'path':<22} {'serialize':>11} {'query+serialize':>17}")
+    for name, serialize, end_to_end in timings:
+        serialize_best = min(timeit.repeat(serialize, number=1, repeat=args.repeat))
+        total_best = min(timeit.repeat(end_to_end, number=1, repeat=args.repeat))
+        print(f"{name:<22} {serialize_best * 1000:8.1f} ms {total_best * 1000:14.1f} ms")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
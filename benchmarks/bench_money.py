@@ -0,0 +1,52 @@
+"""
+Cost of totalling a 10k-line quote.
+
+Compares the previous float loop, a straightforward Decimal loop and
+utils.money.calculate_totals. Run from the repo root:
+
+    python -m benchmarks.bench_money [--lines 10000] [--repeat 20]
+"""
+import argparse
+import random
+import timeit
+from collections import namedtuple
+from decimal import Decimal
+from utils import money
+
+Line = namedtuple("Line", ["quantity", "rate"])
+
+
+def float_totals(lines):
+    subtotal = 0
+    for item in lines:
+        subtotal += item.quantity * float(item.rate)
+    tax = subtotal * 0.10
+    return subtotal, tax, subtotal + tax
+
+
+def decimal_totals(lines):
+    subtotal = sum((item.quantity * item.rate for item in lines), Decimal(0))
+    tax = money.to_money(subtotal * money.DEFAULT_TAX_RATE)
+    return subtotal, tax, subtotal + tax
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    lines = [Line(rng.randint(1, 20), money.to_money(rng.uniform(0.5, 500))) for _ in range(args.lines)]
+
+    exact = money.calculate_totals(lines)
+    drift = Decimal(str(float_totals(lines)[0])) - exact.subtotal
+    print(f"{args.lines} lines, subtotal {exact.subtotal}, float drift {drift}")
+
+    for name, fn in (("float", float_totals), ("decimal", decimal_totals), ("money.calculate_totals", money.calculate_totals)):
+        best = min(timeit.repeat(lambda: fn(lines), number=1, repeat=args.repeat))
+        print(f"{name:<24} {best * 1000:8.2f} ms  ({best / args.lines * 1e9:6.0f} ns/line)")
+
+
+if __name__ == "__main__":
+    main()
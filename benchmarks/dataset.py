@@ -0,0 +1,243 @@
+"""
+Synthetic multi-tenant dataset for benchmarks and local development.
+
+Builds `companies` tenants, each with one user, `clients` clients,
+`quotes` quotes per client with `line_items` line items each, invoices for
+`invoice_ratio` of the quotes and up to `payments` payments per invoice.
+Creation dates are spread over the last `days` days so lists, exports and
+analytics see realistic ranges. Everything is drawn from a seeded RNG, so the
+same spec and seed build the same data.
+
+Every user signs in with BENCH_PASSWORD; usernames are `bench_<n>`.
+Rows are written with bulk INSERT ... RETURNING per company, then invoice
+sequences and analytics rollups are brought in line. Run from the repo root
+against DATABASE_URL:
+
+    python -m benchmarks.dataset --companies 10 --clients 50 [--reset]
+"""
+import argparse
+import random
+from dataclasses import dataclass, asdict
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from config.environment import invoice_number_prefix, invoice_number_padding
+from models.client import Client
+from models.company import Company
+from models.invoice import Invoice
+from models.invoice_sequence import InvoiceSequence
+from models.line_item import LineItem
+from models.payment import Payment
+from models.quote import Quote
+from models.user import UserModel
+from services import rollups
+from services.payment_ledger import refresh_invoice_state
+from utils import money
+from utils.passwords import password_hasher
+
+BENCH_PASSWORD = "bench-password"
+TAX_RATES = ("0.0000", "0.0500", "0.0825", "0.1000", "0.2000")
+PAYMENT_METHODS = ("bank", "stripe", "paypal", "cash")
+SERVICES = ("Design", "Development", "Consulting", "Hosting", "Support", "Training", "Audit", "Licence")
+
+
+@dataclass
+class DatasetSpec:
+    companies: int = 5
+    clients: int = 20
+    quotes: int = 5
+    line_items: int = 5
+    invoice_ratio: float = 0.6
+    payments: int = 2
+    days: int = 365
+    seed: int = 42
+
+
+def _insert(db: Session, model, rows):
+    if not rows:
+        return []
+    return db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), rows).all()
+
+
+def _created_at(rng: random.Random, today: date, days: int) -> datetime:
+    day = today - timedelta(days=rng.randrange(max(days, 1)))
+    return datetime.combine(day, time(rng.randrange(8, 18), rng.randrange(60)))
+
+
+def _generate_company(db: Session, spec: DatasetSpec, rng: random.Random, number: int, password_hash: str, today: date):
+    tax_rate = money.to_rate(rng.choice(TAX_RATES))
+    company_id = db.scalar(insert(Company).values(name=f"Bench Company {number}", tax_rate=tax_rate).returning(Company.id))
+    user_id = db.scalar(insert(UserModel).values(
+        username=f"bench_{number}",
+        email=f"bench_{number}@example.com",
+        password_hash=password_hash,
+        company_name=f"Bench Company {number}",
+        company_id=company_id
+    ).returning(UserModel.id))
+
+    client_ids = _insert(db, Client, [
+        {
+            "company_id": company_id,
+            "user_id": user_id,
+            "name": f"Client {number}-{index}",
+            "email": f"client_{number}_{index}@example.com",
+            "phone": f"555-{rng.randrange(10000):04d}",
+            "total_billed": 0
+        }
+        for index in range(spec.clients)
+    ])
+
+    quotes = []
+    for client_id in client_ids:
+        for index in range(spec.quotes):
+            items = [
+                SimpleNamespace(
+                    description=f"{rng.choice(SERVICES)} {position + 1}",
+                    quantity=rng.randint(1, 20),
+                    rate=money.to_money(rng.uniform(5, 500))
+                )
+                for position in range(spec.line_items)
+            ]
+            totals = money.calculate_totals(items, tax_rate)
+            created_at = _created_at(rng, today, spec.days)
+            invoiced = rng.random() < spec.invoice_ratio
+            quotes.append((client_id, created_at, invoiced, items, {
+                "company_id": company_id,
+                "client_id": client_id,
+                "title": f"Quote {index + 1} for client {client_id}",
+                "status": "accepted" if invoiced else rng.choice(("draft", "sent")),
+                "tax_rate": tax_rate,
+                "expiry_date": created_at.date() + timedelta(days=30),
+                "created_at": created_at,
+                "updated_at": created_at,
+                "subtotal": totals.subtotal,
+                "tax": totals.tax,
+                "total": totals.total
+            }))
+    quote_ids = _insert(db, Quote, [row for *_, row in quotes])
+
+    line_item_rows = [
+        {
+            "quote_id": quote_id,
+            "description": item.description,
+            "quantity": item.quantity,
+            "rate": item.rate,
+            "total": money.line_total(item.quantity, item.rate)
+        }
+        for quote_id, (_, _, _, items, _) in zip(quote_ids, quotes)
+        for item in items
+    ]
+    if line_item_rows:
+        db.execute(insert(LineItem), line_item_rows)
+
+    invoices = []
+    payment_rows = []
+    for quote_id, (_, created_at, invoiced, _, row) in zip(quote_ids, quotes):
+        if not invoiced:
+            continue
+        invoice = SimpleNamespace(
+            total=row["total"],
+            total_paid=money.to_money(0),
+            balance_due=row["total"],
+            status="sent",
+            due_date=created_at.date() + timedelta(days=30)
+        )
+        paid_at = created_at
+        for _ in range(rng.randint(0, spec.payments)):
+            remaining = invoice.total - invoice.total_paid
+            if remaining <= 0:
+                break
+            # Half the time settle in full, otherwise pay a part of what is left
+            amount = remaining if rng.random() < 0.5 else money.to_money(remaining * money.to_money(rng.uniform(0.1, 0.9)))
+            paid_at = min(paid_at + timedelta(days=rng.randint(1, 40)), datetime.combine(today, time(12)))
+            invoice.total_paid += amount
+            payment_rows.append((len(invoices), {
+                "company_id": company_id,
+                "amount": amount,
+                "method": rng.choice(PAYMENT_METHODS),
+                "reference": f"REF-{rng.randrange(10 ** 8):08d}",
+                "paid_at": paid_at,
+                "created_at": paid_at
+            }))
+        refresh_invoice_state(invoice)
+        invoices.append({
+            "company_id": company_id,
+            "quote_id": quote_id,
+            "invoice_number": f"{invoice_number_prefix}{len(invoices) + 1:0{invoice_number_padding}d}",
+            "title": row["title"].replace("Quote", "Invoice", 1),
+            "due_date": invoice.due_date,
+            "status": invoice.status,
+            "subtotal": row["subtotal"],
+            "tax": row["tax"],
+            "total": row["total"],
+            "total_paid": invoice.total_paid,
+            "balance_due": invoice.balance_due,
+            "created_at": created_at,
+            "updated_at": created_at
+        })
+    invoice_ids = _insert(db, Invoice, invoices)
+    if payment_rows:
+        db.execute(insert(Payment), [{"invoice_id": invoice_ids[index], **payment} for index, payment in payment_rows])
+
+    db.execute(insert(InvoiceSequence).values(
+        company_id=company_id, prefix=invoice_number_prefix, next_value=len(invoices) + 1
+    ))
+    return {
+        "clients": len(client_ids),
+        "quotes": len(quote_ids),
+        "line_items": len(line_item_rows),
+        "invoices": len(invoice_ids),
+        "payments": len(payment_rows)
+    }
+
+
+def generate(db: Session, spec: DatasetSpec, today: date = None) -> dict:
+    """Insert the dataset described by spec, one transaction per company. Returns row counts."""
+    rng = random.Random(spec.seed)
+    today = today or date.today()
+    # bcrypt is deliberately slow, so every user shares one hash
+    password_hash = password_hasher.hash(BENCH_PASSWORD)
+
+    counts = {"companies": 0, "clients": 0, "quotes": 0, "line_items": 0, "invoices": 0, "payments": 0}
+    for number in range(1, spec.companies + 1):
+        for key, value in _generate_company(db, spec, rng, number, password_hash, today).items():
+            counts[key] += value
+        counts["companies"] += 1
+        db.commit()
+
+    rollups.rebuild(db)
+    db.commit()
+    return counts
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    defaults = DatasetSpec()
+    for field, value in asdict(defaults).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(value), default=value)
+
+
+def spec_from_arguments(args) -> DatasetSpec:
+    return DatasetSpec(**{field: getattr(args, field) for field in asdict(DatasetSpec())})
+
+
+if __name__ == "__main__":
+    from database import SessionLocal, engine
+    from models.base import Base
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate every table first")
+    args = parser.parse_args()
+
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        counts = generate(db, spec_from_arguments(args))
+    finally:
+        db.close()
+    print(", ".join(f"{value} {key}" for key, value in counts.items()))
+    print(f"Sign in as bench_1 .. bench_{args.companies} with password '{BENCH_PASSWORD}'")
@@ -0,0 +1,280 @@
+"""
+In-process load test of every router in main.py.
+
+Drives the app through httpx's ASGI transport (no sockets, the full
+middleware stack and lifespan), one scenario at a time, with `--concurrency`
+requests in flight. Each scenario reports p50/p95/p99 latency, SQL queries
+per request (from the Server-Timing header, so streamed responses only count
+queries issued before their headers) and throughput.
+
+Without --database-url the run gets a fresh SQLite file filled by
+benchmarks.dataset; with one it expects `python -m benchmarks.dataset` to
+have loaded it already (or pass --generate, which drops every table first).
+Write scenarios add rows, so regenerate before comparing runs.
+
+    python -m benchmarks.load_test --output baseline.json
+    python -m benchmarks.load_test --compare baseline.json --threshold 0.2
+
+--compare exits 1 if any scenario's p95 grew by more than the threshold or
+it issues more queries per request than the baseline did.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Callable
+
+QUERIES_PATTERN = re.compile(r'desc="(\d+) queries')
+
+# Numbers every request of the run, so rows created by write scenarios stay unique across warmup and timed passes
+_request_numbers = itertools.count()
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    # (tenant, rng, sequence number) -> (url, json body or None)
+    build: Callable
+
+
+def _line_items(rng, count=5):
+    return [{"description": f"Item {index + 1}", "quantity": rng.randint(1, 10), "rate": round(rng.uniform(5, 500), 2)} for index in range(count)]
+
+
+SCENARIOS = [
+    Scenario("users.sign_in", "POST", lambda t, rng, n: ("/api/sign-in", {"username": t["username"], "password": t["password"]})),
+    Scenario("clients.list", "GET", lambda t, rng, n: ("/api/clients/?limit=50", None)),
+    Scenario("clients.get", "GET", lambda t, rng, n: (f"/api/clients/{rng.choice(t['client_ids'])}", None)),
+    Scenario("clients.create", "POST", lambda t, rng, n: ("/api/clients/", {"name": f"Load {n}", "email": f"load_{t['company_id']}_{n}@example.com"})),
+    Scenario("quotes.list", "GET", lambda t, rng, n: ("/api/quotes/?limit=50", None)),
+    Scenario("quotes.get", "GET", lambda t, rng, n: (f"/api/quotes/{rng.choice(t['quote_ids'])}", None)),
+    Scenario("quotes.create", "POST", lambda t, rng, n: ("/api/quotes/", {"client_id": rng.choice(t["client_ids"]), "title": f"Load {n}", "line_items": _line_items(rng)})),
+    Scenario("quotes.update", "PUT", lambda t, rng, n: (f"/api/quotes/{rng.choice(t['draft_quote_ids'])}", {"line_items": _line_items(rng)})),
+    Scenario("quotes.pdf", "GET", lambda t, rng, n: (f"/api/quotes/{rng.choice(t['quote_ids'])}/pdf", None)),
+    Scenario("invoices.list", "GET", lambda t, rng, n: ("/api/invoices/?limit=50", None)),
+    Scenario("invoices.get", "GET", lambda t, rng, n: (f"/api/invoices/{rng.choice(t['invoice_ids'])}", None)),
+    Scenario("invoices.pdf", "GET", lambda t, rng, n: (f"/api/invoices/{rng.choice(t['invoice_ids'])}/pdf", None)),
+    Scenario("payments.create", "POST", lambda t, rng, n: (f"/api/invoices/{rng.choice(t['open_invoice_ids'])}/payments", {"amount": 0.01, "method": "bank"})),
+    Scenario("analytics.summary", "GET", lambda t, rng, n: ("/api/analytics/summary", None)),
+    Scenario("analytics.export", "GET", lambda t, rng, n: ("/api/analytics/export?kind=invoices", None)),
+]
+
+
+def percentile(ordered: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def load_tenants(db, password: str, limit: int) -> list:
+    from sqlalchemy import select
+    from models.invoice import Invoice
+    from models.quote import Quote
+    from models.client import Client
+    from models.user import UserModel
+
+    tenants = []
+    users = db.execute(select(UserModel.username, UserModel.company_id).where(UserModel.username.like("bench\\_%", escape="\\")).order_by(UserModel.id).limit(limit))
+    for username, company_id in users:
+        quotes = db.execute(select(Quote.id, Quote.status).where(Quote.company_id == company_id)).all()
+        invoices = db.execute(select(Invoice.id, Invoice.balance_due).where(Invoice.company_id == company_id)).all()
+        tenants.append({
+            "username": username,
+            "password": password,
+            "company_id": company_id,
+            "client_ids": db.scalars(select(Client.id).where(Client.company_id == company_id)).all(),
+            "quote_ids": [quote_id for quote_id, _ in quotes],
+            "draft_quote_ids": [quote_id for quote_id, quote_status in quotes if quote_status == "draft"],
+            "invoice_ids": [invoice_id for invoice_id, _ in invoices],
+            "open_invoice_ids": [invoice_id for invoice_id, balance in invoices if balance >= 10]
+        })
+    return [tenant for tenant in tenants if all(tenant[key] for key in ("client_ids", "draft_quote_ids", "open_invoice_ids"))]
+
+
+async def run_scenario(client, scenario: Scenario, tenants: list, requests: int, concurrency: int, rng: random.Random) -> dict:
+    latencies, queries, errors = [], [], []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            number = next(_request_numbers)
+            tenant = tenants[number % len(tenants)]
+            url, body = scenario.build(tenant, rng, number)
+            started = time.perf_counter()
+            response = await client.request(scenario.method, url, json=body, headers=tenant["headers"])
+            latencies.append(time.perf_counter() - started)
+            match = QUERIES_PATTERN.search(response.headers.get("server-timing", ""))
+            if match:
+                queries.append(int(match.group(1)))
+            if response.status_code >= 400:
+                errors.append(f"{response.status_code} {response.text[:200]}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    if errors:
+        print(f"  {scenario.name}: {len(errors)} error(s), first: {errors[0]}", file=sys.stderr)
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0
+    }
+
+
+async def run(app, tenants: list, scenarios: list, requests: int, concurrency: int, warmup: int, seed: int) -> dict:
+    import httpx
+
+    rng = random.Random(seed)
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=120) as client:
+            for tenant in tenants:
+                response = await client.post("/api/sign-in", json={"username": tenant["username"], "password": tenant["password"]})
+                response.raise_for_status()
+                tenant["headers"] = {"Authorization": f"Bearer {response.json()['token']}"}
+
+            for scenario in scenarios:
+                if warmup:
+                    await run_scenario(client, scenario, tenants, warmup, 1, rng)
+                results[scenario.name] = await run_scenario(client, scenario, tenants, requests, concurrency, rng)
+                print(_format_row(scenario.name, results[scenario.name]))
+    return results
+
+
+def _format_row(name: str, result: dict) -> str:
+    queries = "-" if result["queries_per_request"] is None else f"{result['queries_per_request']:.1f}"
+    return (
+        f"{name:<20} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+        f"{queries:>8} {result['throughput_rps']:>9.1f} {result['errors']:>6}"
+    )
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print deltas against a baseline file's scenarios; returns the names that regressed."""
+    regressions = []
+    print(f"\n{'scenario':<20} {'p95 base':>9} {'p95 now':>9} {'change':>8} {'queries':>11}")
+    for name, result in results.items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        change = (result["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        more_queries = (result["queries_per_request"] or 0) > (before["queries_per_request"] or 0)
+        regressed = change > threshold or more_queries
+        if regressed:
+            regressions.append(name)
+        queries = f"{before['queries_per_request']} -> {result['queries_per_request']}"
+        print(f"{name:<20} {before['p95_ms']:>9.2f} {result['p95_ms']:>9.2f} {change:>+7.0%} {queries:>11}{'  REGRESSED' if regressed else ''}")
+    return regressions
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _prepare_environment(argv=None):
+    """Point the app at the target database; settings are read at import time, so this runs before anything is loaded."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--database-url", default=None)
+    known, _ = parser.parse_known_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="inflow-load-")
+    os.environ["DATABASE_URL"] = known.database_url or f"sqlite:///{os.path.join(workdir, 'load.db')}"
+    os.environ.setdefault("JWT_SECRET", "load-test-secret-load-test-secret")
+    os.environ.setdefault("PDF_CACHE_DIR", os.path.join(workdir, "pdf_cache"))
+    os.environ["METRICS_ENABLED"] = "true"
+    os.environ["SERVER_TIMING_ENABLED"] = "true"
+
+
+def main():
+    _prepare_environment()
+    from benchmarks import dataset
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="database to test against (default: a fresh SQLite file)")
+    parser.add_argument("--generate", action="store_true", help="drop every table of --database-url and load a new dataset")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5, help="untimed requests per scenario")
+    parser.add_argument("--tenants", type=int, default=5, help="companies the requests are spread over")
+    parser.add_argument("--scenario", action="append", choices=[scenario.name for scenario in SCENARIOS], help="run only these (repeatable)")
+    parser.add_argument("--output", default=None, help="write results as JSON to this file")
+    parser.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative p95 growth before --compare fails")
+    dataset.add_arguments(parser)
+    args = parser.parse_args()
+    generate = args.generate or args.database_url is None
+
+    from main import app
+    from database import SessionLocal, engine
+    from models.base import Base
+
+    spec = dataset.spec_from_arguments(args)
+    db = SessionLocal()
+    try:
+        if generate:
+            Base.metadata.drop_all(bind=engine)
+            Base.metadata.create_all(bind=engine)
+            started = time.perf_counter()
+            counts = dataset.generate(db, spec)
+            print(f"Dataset: {', '.join(f'{value} {key}' for key, value in counts.items())} ({time.perf_counter() - started:.1f}s)")
+        tenants = load_tenants(db, dataset.BENCH_PASSWORD, args.tenants)
+    finally:
+        db.close()
+    if not tenants:
+        parser.error("no bench_<n> users with clients, draft quotes and open invoices; load a dataset first")
+
+    scenarios = [scenario for scenario in SCENARIOS if not args.scenario or scenario.name in args.scenario]
+    print(f"{'scenario':<20} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'req/s':>9} {'errors':>6}")
+    results = asyncio.run(run(app, tenants, scenarios, args.requests, args.concurrency, args.warmup, spec.seed))
+
+    report = {
+        "meta": {
+            "commit": _commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "dataset": asdict(spec) if generate else None,
+            "tenants": len(tenants),
+            "requests": args.requests,
+            "concurrency": args.concurrency
+        },
+        "scenarios": results
+    }
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions = compare(results, json.load(baseline), args.threshold)
+        if regressions:
+            print(f"Regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,93 @@
 import os
+import sys
 from dotenv import load_dotenv
 
 load_dotenv()
 
 db_URI = os.getenv('DATABASE_URL')
-secret = os.getenv('JWT_SECRET')
\ No newline at end of file
+secret = os.getenv('JWT_SECRET')
+
+# Database engine / pool tuning
+db_replica_URI = os.getenv('DATABASE_REPLICA_URL')
+db_pool_size = int(os.getenv('DB_POOL_SIZE', 10))
+db_max_overflow = int(os.getenv('DB_MAX_OVERFLOW', 20))
+db_pool_timeout = int(os.getenv('DB_POOL_TIMEOUT', 30))
+db_pool_recycle = int(os.getenv('DB_POOL_RECYCLE', 1800))
+db_pool_pre_ping = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+db_statement_timeout_ms = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 0))
+db_application_name = os.getenv('DB_APPLICATION_NAME', 'inflow-api')
+
+# Async request path (asyncpg). ASYNC_ROUTERS is a comma separated list of
+# routers whose read endpoints are served by the async stack, e.g. "analytics,quotes".
+async_db_URI = os.getenv('ASYNC_DATABASE_URL')
+async_routers = [name.strip() for name in os.getenv('ASYNC_ROUTERS', '').split(',') if name.strip()]
+
+# Authentication fast path
+auth_cache_ttl = int(os.getenv('AUTH_CACHE_TTL', 60))
+auth_cache_size = int(os.getenv('AUTH_CACHE_SIZE', 10000))
+auth_trust_token_claims = os.getenv('AUTH_TRUST_TOKEN_CLAIMS', 'false').lower() == 'true'
+
+# Password hashing
+password_bcrypt_rounds = int(os.getenv('PASSWORD_BCRYPT_ROUNDS', 12))
+password_hash_workers = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+password_hash_max_pending = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 16))
+password_hash_timeout = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+
+# Response cache: "memory" (per process) or "redis" (shared, needs the redis package)
+cache_backend = os.getenv('CACHE_BACKEND', 'memory')
+cache_redis_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+cache_ttl = int(os.getenv('CACHE_TTL', 300))
+cache_max_entries = int(os.getenv('CACHE_MAX_ENTRIES', 10000))
+
+def _server_workers(argv):
+    """--workers / -w as passed to uvicorn or gunicorn; worker processes inherit the server's argv."""
+    for index, arg in enumerate(argv):
+        if arg.startswith('--workers='):
+            return int(arg.split('=', 1)[1])
+        if arg in ('--workers', '-w') and index + 1 < len(argv):
+            return int(argv[index + 1])
+    return None
+
+# Worker processes serving the API: the server's --workers flag, else WEB_CONCURRENCY
+# (the default uvicorn and gunicorn use). Per-process caches are turned off above one.
+web_concurrency = _server_workers(sys.argv) or int(os.getenv('WEB_CONCURRENCY', 1))
+
+# Rendered PDF cache on local disk; PDF_CACHE_MAX_MB=0 disables it
+pdf_cache_dir = os.getenv('PDF_CACHE_DIR', '.pdf_cache')
+pdf_cache_max_bytes = int(os.getenv('PDF_CACHE_MAX_MB', 256)) * 1024 * 1024
+
+# PDF rendering process pool; PDF_RENDER_WORKERS=0 renders inline
+pdf_render_workers = int(os.getenv('PDF_RENDER_WORKERS', 2))
+pdf_render_max_pending = int(os.getenv('PDF_RENDER_MAX_PENDING', 32))
+pdf_render_timeout = float(os.getenv('PDF_RENDER_TIMEOUT', 30))
+
+# Invoice numbering: new companies start at "<prefix><zero-padded counter>", e.g. INV-0001
+invoice_number_prefix = os.getenv('INVOICE_NUMBER_PREFIX', 'INV-')
+invoice_number_padding = int(os.getenv('INVOICE_NUMBER_PADDING', 4))
+
+# Status transition jobs (overdue invoices, expired quotes). STATUS_JOBS_INTERVAL
+# runs them in-process every N seconds; 0 leaves scheduling to cron.
+status_jobs_interval = int(os.getenv('STATUS_JOBS_INTERVAL', 0))
+status_jobs_batch_size = int(os.getenv('STATUS_JOBS_BATCH_SIZE', 1000))
+
+# Request instrumentation: per-route timing / SQL metrics at /metrics, and a
+# Server-Timing header on every response
+metrics_enabled = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+server_timing_enabled = os.getenv('SERVER_TIMING_ENABLED', 'true').lower() == 'true'
+
+# Slow-query log (opt-in): statements above the threshold go to a rotating JSONL
+# file; on PostgreSQL a sampled fraction of slow SELECTs gets an EXPLAIN (ANALYZE, BUFFERS) plan
+slow_query_log_enabled = os.getenv('SLOW_QUERY_LOG', 'false').lower() == 'true'
+slow_query_threshold_ms = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+slow_query_explain_sample_rate = float(os.getenv('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0.1))
+slow_query_log_file = os.getenv('SLOW_QUERY_LOG_FILE', 'slow_queries.jsonl')
+slow_query_log_max_bytes = int(os.getenv('SLOW_QUERY_LOG_MAX_MB', 10)) * 1024 * 1024
+slow_query_log_backups = int(os.getenv('SLOW_QUERY_LOG_BACKUPS', 5))
+
+# Sampling profiler (opt-in): profiles PROFILER_SAMPLE_RATE of requests, and any
+# request sent with "X-Profile: <PROFILER_TOKEN>", into collapsed stacks per route
+profiler_enabled = os.getenv('PROFILER_ENABLED', 'false').lower() == 'true'
+profiler_sample_rate = float(os.getenv('PROFILER_SAMPLE_RATE', 0))
+profiler_token = os.getenv('PROFILER_TOKEN', '')
+profiler_interval_ms = float(os.getenv('PROFILER_INTERVAL_MS', 5))
+profiler_dir = os.getenv('PROFILER_DIR', '.profiles')
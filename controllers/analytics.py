@@ -1,70 +1,111 @@
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from database import get_db
-from dependencies.get_current_user import get_current_user
-from models.user import UserModel
+from sqlalchemy import func, case
+from typing import Literal, Optional
+from database import get_read_db
+from dependencies.get_current_user import get_read_tenant, TenantContext
 from models.client import Client
-from models.quote import Quote
-from models.invoice import Invoice
-from models.payment import Payment
+from models.analytics_rollup import RevenueDaily, RevenueByClient, InvoiceDueRollup
+from services import analytics_cache, exports
+from utils.cache import cache
+from utils.money import to_money
 import datetime
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
-@router.get("/summary")
 @router.get("/summary")
 def get_analytics_summary(
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    if_none_match: str = Header(None),
+    db: Session = Depends(get_read_db),
+    current_user: TenantContext = Depends(get_read_tenant)
+):
+    cache_key = analytics_cache.summary_cache_key(current_user.company_id)
+    entry = cache.get(cache_key)
+    if entry is None:
+        entry = analytics_cache.cache_summary(cache_key, jsonable_encoder(build_analytics_summary(db, current_user.company_id)))
+
+    headers = {"ETag": entry["etag"], "Cache-Control": "private, no-cache"}
+    # Same content as the client's copy: skip sending the body
+    if analytics_cache.etag_matches(if_none_match, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse(entry["summary"], headers=headers)
+
+
+@router.get("/export")
+def export_data(
+    kind: Literal["payments", "invoices", "line_items"] = "payments",
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    start: Optional[datetime.date] = None,
+    end: Optional[datetime.date] = None,
+    gzip: bool = False,
+    current_user: TenantContext = Depends(get_read_tenant)
 ):
+    """Stream payments, invoices or line items as CSV or NDJSON, optionally gzipped."""
+    extension = "csv" if export_format == "csv" else "ndjson"
+    filename = f"{kind}_{start or 'all'}_{end or 'all'}.{extension}"
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        exports.stream_export(kind, export_format, current_user.company_id, start, end, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+def build_analytics_summary(db: Session, company_id: int):
+    """Shared by the sync route and the async route (via AsyncSession.run_sync)."""
     today = datetime.date.today()
     first_day_of_month = today.replace(day=1)
 
     # 1. Revenue this month
-    total_revenue_month = db.query(func.sum(Payment.amount)).join(Invoice).join(Quote).join(Client).join(UserModel).filter(
-        UserModel.company_name == current_user.company_name,
-        Payment.paid_at >= first_day_of_month
-    ).scalar() or 0
-
-    # 2. Outstanding Balance
-    total_outstanding = db.query(func.sum(Invoice.balance_due)).join(Quote).join(Client).join(UserModel).filter(
-        UserModel.company_name == current_user.company_name
-    ).scalar() or 0
-
-    # 3. Overdue Invoices Count
-    overdue_count = db.query(func.count(Invoice.id)).join(Quote).join(Client).join(UserModel).filter(
-        UserModel.company_name == current_user.company_name,
-        Invoice.due_date < today,
-        Invoice.balance_due > 0
-    ).scalar() or 0
-
-    # 4. Revenue by Month
-    revenue_by_month_query = db.query(
-        func.to_char(Payment.paid_at, 'YYYY-MM').label('month'),
-        func.sum(Payment.amount).label('total')
-    ).join(Invoice).join(Quote).join(Client).join(UserModel).filter(
-        UserModel.company_name == current_user.company_name
-    ).group_by('month').all()
-
-    revenue_by_month = [{"month": row.month, "total": row.total} for row in revenue_by_month_query]
+    total_revenue_month = db.query(func.sum(RevenueDaily.total)).filter(
+        RevenueDaily.company_id == company_id,
+        RevenueDaily.day >= first_day_of_month
+    ).scalar()
+
+    # 2. Outstanding Balance / 3. Overdue Invoices Count
+    total_outstanding, overdue_count = db.query(
+        func.sum(InvoiceDueRollup.outstanding),
+        func.sum(case((InvoiceDueRollup.due_date < today, InvoiceDueRollup.open_count), else_=0))
+    ).filter(
+        InvoiceDueRollup.company_id == company_id
+    ).one()
+    overdue_count = overdue_count or 0
+
+    # 4. Revenue by Month (one row per active day, folded into months here)
+    daily_rows = db.query(RevenueDaily.day, RevenueDaily.total).filter(
+        RevenueDaily.company_id == company_id,
+        RevenueDaily.total != 0
+    ).order_by(RevenueDaily.day).all()
+
+    months = {}
+    for day, total in daily_rows:
+        month = day.strftime('%Y-%m')
+        months[month] = months.get(month, 0) + to_money(total)
+
+    revenue_by_month = [{"month": month, "total": total} for month, total in months.items()]
 
     # 5. Revenue by Client
     revenue_by_client_query = db.query(
         Client.name,
-        func.sum(Payment.amount).label('total')
-    ).join(Quote, Client.id == Quote.client_id).join(Invoice).join(Payment).join(UserModel).filter(
-        UserModel.company_name == current_user.company_name
+        func.sum(RevenueByClient.total).label('total')
+    ).join(Client, Client.id == RevenueByClient.client_id).filter(
+        RevenueByClient.company_id == company_id,
+        RevenueByClient.total != 0
     ).group_by(Client.name).all()
 
-    revenue_by_client = [{"client": row.name, "total": row.total} for row in revenue_by_client_query]
+    revenue_by_client = [{"client": row.name, "total": to_money(row.total)} for row in revenue_by_client_query]
 
     return {
-        "total_revenue_this_month": total_revenue_month,
-        "total_outstanding": total_outstanding,
+        "total_revenue_this_month": to_money(total_revenue_month or 0),
+        "total_outstanding": to_money(total_outstanding or 0),
         "overdue_count": overdue_count,
         "revenue_by_month": revenue_by_month,
         "revenue_by_client": revenue_by_client
     }
-
-
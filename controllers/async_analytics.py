@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Header, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from async_database import get_async_db
+from dependencies.get_current_user import TenantContext
+from dependencies.get_current_user_async import get_read_tenant_async
+from controllers.analytics import build_analytics_summary
+from services import analytics_cache
+from utils.cache import cache
+
+router = APIRouter(prefix="/analytics", include_in_schema=False)
+
+@router.get("/summary")
+async def get_analytics_summary(
+    if_none_match: str = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TenantContext = Depends(get_read_tenant_async)
+):
+    cache_key = analytics_cache.summary_cache_key(current_user.company_id)
+    entry = cache.get(cache_key)
+    if entry is None:
+        entry = analytics_cache.cache_summary(cache_key, jsonable_encoder(await db.run_sync(build_analytics_summary, current_user.company_id)))
+
+    headers = {"ETag": entry["etag"], "Cache-Control": "private, no-cache"}
+    # Same content as the client's copy: skip sending the body
+    if analytics_cache.etag_matches(if_none_match, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse(entry["summary"], headers=headers)
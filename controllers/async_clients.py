@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from async_database import get_async_db
+from models.client import Client
+from serializers.client import ClientResponse
+from serializers.pagination import Page
+from dependencies.filters import ClientFilters
+from dependencies.get_current_user import TenantContext
+from dependencies.get_current_user_async import get_read_tenant_async
+from utils.pagination import PageParams, apply_keyset, build_page
+
+router = APIRouter(prefix="/clients", include_in_schema=False)
+
+@router.get("/", response_model=Page[ClientResponse])
+async def get_clients(
+    page: PageParams = Depends(),
+    filters: ClientFilters = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TenantContext = Depends(get_read_tenant_async)
+):
+    stmt = filters.apply(select(Client).where(Client.company_id == current_user.company_id))
+    rows = await db.scalars(apply_keyset(stmt, Client, page))
+    return build_page(rows.all(), page)
+
+@router.get("/{client_id}", response_model=ClientResponse)
+async def get_client(
+    client_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TenantContext = Depends(get_read_tenant_async)
+):
+    client = await db.scalar(select(Client).where(
+        Client.id == client_id,
+        Client.company_id == current_user.company_id
+    ))
+
+    if not client:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Client not found"
+        )
+    return client
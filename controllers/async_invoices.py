@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from async_database import get_async_db
+from models.invoice import Invoice
+from serializers.invoice import InvoiceResponse
+from serializers.pagination import Page
+from dependencies.filters import InvoiceFilters
+from dependencies.get_current_user import TenantContext
+from dependencies.get_current_user_async import get_read_tenant_async
+from controllers.invoices import INVOICE_RESPONSE_OPTIONS
+from utils.pagination import PageParams, apply_keyset, build_page
+from utils.json_response import FastJSONResponse
+from services import list_rows
+
+router = APIRouter(prefix="/invoices", include_in_schema=False)
+
+@router.get("/", response_model=Page[InvoiceResponse])
+async def get_invoices(
+    page: PageParams = Depends(),
+    filters: InvoiceFilters = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TenantContext = Depends(get_read_tenant_async)
+):
+    stmt = filters.apply(list_rows.invoice_list_statement(current_user.company_id))
+    result = build_page(await db.execute(apply_keyset(stmt, Invoice, page)), page)
+    invoice_ids = [row.id for row in result["items"]]
+    payments = await db.execute(list_rows.payments_statement(invoice_ids)) if invoice_ids else []
+    result["items"] = list_rows.invoice_rows(result["items"], payments)
+    return FastJSONResponse(result)
+
+@router.get("/{invoice_id}", response_model=InvoiceResponse)
+async def get_invoice(
+    invoice_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TenantContext = Depends(get_read_tenant_async)
+):
+    invoice = await db.scalar(select(Invoice).options(*INVOICE_RESPONSE_OPTIONS).where(Invoice.id == invoice_id, Invoice.company_id == current_user.company_id))
+    if not invoice:
+        raise HTTPException(status_code=404, detail="Invoice not found")
+    return invoice
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from async_database import get_async_db
+from models.quote import Quote
+from serializers.quote import QuoteResponse
+from serializers.pagination import Page
+from dependencies.filters import QuoteFilters
+from dependencies.get_current_user import TenantContext
+from dependencies.get_current_user_async import get_read_tenant_async
+from controllers.quotes import QUOTE_RESPONSE_OPTIONS
+from utils.pagination import PageParams, apply_keyset, build_page
+from utils.json_response import FastJSONResponse
+from services import list_rows
+
+router = APIRouter(prefix="/quotes", include_in_schema=False)
+
+@router.get("/", response_model=Page[QuoteResponse])
+async def get_quotes(
+    page: PageParams = Depends(),
+    filters: QuoteFilters = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TenantContext = Depends(get_read_tenant_async)
+):
+    stmt = filters.apply(list_rows.quote_list_statement(current_user.company_id))
+    result = build_page(await db.execute(apply_keyset(stmt, Quote, page)), page)
+    quote_ids = [row.id for row in result["items"]]
+    line_items = await db.execute(list_rows.line_items_statement(quote_ids)) if quote_ids else []
+    result["items"] = list_rows.quote_rows(result["items"], line_items)
+    return FastJSONResponse(result)
+
+@router.get("/{quote_id}", response_model=QuoteResponse)
+async def get_quote(
+    quote_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: TenantContext = Depends(get_read_tenant_async)
+):
+    quote = await db.scalar(select(Quote).options(*QUOTE_RESPONSE_OPTIONS).where(Quote.id == quote_id, Quote.company_id == current_user.company_id))
+    if not quote:
+        raise HTTPException(status_code=404, detail="Quote not found")
+    return quote
@@ -2,32 +2,37 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from database import get_db
+from database import get_db, get_read_db
 from models.client import Client
-from models.user import UserModel
 from serializers.client import ClientCreate, ClientUpdate, ClientResponse
-from dependencies.get_current_user import get_current_user
+from serializers.pagination import Page
+from dependencies.filters import ClientFilters
+from utils.pagination import PageParams, paginate
+from dependencies.get_current_user import get_current_tenant, get_read_tenant, TenantContext
 
 router = APIRouter(prefix="/clients", tags=["Clients"])
 
-@router.get("/", response_model=List[ClientResponse])
+@router.get("/", response_model=Page[ClientResponse])
 def get_clients(
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    page: PageParams = Depends(),
+    filters: ClientFilters = Depends(),
+    db: Session = Depends(get_read_db),
+    current_user: TenantContext = Depends(get_read_tenant)
 ):
-    """List all clients for the current user's company."""
-    return db.query(Client).join(UserModel).filter(UserModel.company_name == current_user.company_name).all()
+    """List the current user's company's clients, newest first, one page at a time."""
+    query = filters.apply(db.query(Client).filter(Client.company_id == current_user.company_id))
+    return paginate(query, Client, page)
 
 @router.post("/", response_model=ClientResponse, status_code=status.HTTP_201_CREATED)
 def create_client(
     client: ClientCreate,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: TenantContext = Depends(get_current_tenant)
 ):
     """Create a new client for the current user."""
     # Check existence within the same company
-    existing_client = db.query(Client).join(UserModel).filter(
-        UserModel.company_name == current_user.company_name,
+    existing_client = db.query(Client).filter(
+        Client.company_id == current_user.company_id,
         Client.email == client.email
     ).first()
     
@@ -39,7 +44,8 @@ def create_client(
 
     new_client = Client(
         **client.model_dump(),
-        user_id=current_user.id
+        user_id=current_user.id,
+        company_id=current_user.company_id
     )
     db.add(new_client)
     db.commit()
@@ -49,13 +55,13 @@ def create_client(
 @router.get("/{client_id}", response_model=ClientResponse)
 def get_client(
     client_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: TenantContext = Depends(get_read_tenant)
 ):
     """Get a specific client by ID (Company Shared)."""
-    client = db.query(Client).join(UserModel).filter(
+    client = db.query(Client).filter(
         Client.id == client_id,
-        UserModel.company_name == current_user.company_name
+        Client.company_id == current_user.company_id
     ).first()
     
     if not client:
@@ -70,12 +76,12 @@ def update_client(
     client_id: int,
     client_update: ClientUpdate,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: TenantContext = Depends(get_current_tenant)
 ):
     """Update a specific client (Company Shared)."""
-    client = db.query(Client).join(UserModel).filter(
+    client = db.query(Client).filter(
         Client.id == client_id,
-        UserModel.company_name == current_user.company_name
+        Client.company_id == current_user.company_id
     ).first()
     
     if not client:
@@ -95,12 +101,12 @@ def update_client(
 def delete_client(
     client_id: int,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: TenantContext = Depends(get_current_tenant)
 ):
     """Delete a specific client (Company Shared)."""
-    client = db.query(Client).join(UserModel).filter(
+    client = db.query(Client).filter(
         Client.id == client_id,
-        UserModel.company_name == current_user.company_name
+        Client.company_id == current_user.company_id
     ).first()
     
     if not client:
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 from models.payment import Payment
@@ -7,100 +8,81 @@ from models.quote import Quote
 from models.client import Client
 from serializers.payment import PaymentCreate, PaymentResponse
 from database import get_db
-from dependencies.get_current_user import get_current_user
-from models.user import UserModel
-from datetime import date, datetime
+from dependencies.get_current_user import get_current_tenant, TenantContext
+from datetime import datetime
+from services import rollups, analytics_cache, payment_ledger
 
 router = APIRouter(prefix="", tags=["Payments"]) # Prefix handle in main or per-endpoint if needed
 
 
 
-def recalculate_invoice_state(invoice: Invoice):
-    """
-    Recalculates balance due and updates status based on total payments.
-    Ensures balance never exceeds total and updates status (paid/sent/overdue).
-    """
-    total_paid = sum(payment.amount for payment in invoice.payments)
-    
-    invoice.balance_due = max(invoice.total - total_paid, 0)
-    
-    # Status Logic
-    if invoice.balance_due == 0 and invoice.total > 0:
-        invoice.status = "paid"
-    else:
-        if invoice.status == "paid": 
-             invoice.status = "sent"
-        
-        # Check overdue
-        if invoice.due_date and invoice.due_date < date.today():
-            invoice.status = "overdue"
-        elif invoice.status == "overdue" and invoice.due_date and invoice.due_date >= date.today():
-            invoice.status = "sent" # Unlikely unless date changed, but good safety
-
 @router.post("/invoices/{invoice_id}/payments", response_model=PaymentResponse, status_code=status.HTTP_201_CREATED)
 def create_payment(
     invoice_id: int,
     payment_data: PaymentCreate,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: TenantContext = Depends(get_current_tenant)
 ):
-    invoice = db.query(Invoice).join(Quote).join(Client).join(UserModel).filter(Invoice.id == invoice_id, UserModel.company_name == current_user.company_name).first()
+    invoice = payment_ledger.lock_invoice(db, invoice_id, current_user.company_id)
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
 
-    # Safety: Recalculate first to ensure balance_due is accurate
-    recalculate_invoice_state(invoice)
+    before = rollups.invoice_state(invoice)
+    balance_due = max(invoice.total - invoice.total_paid, 0)
 
-    if payment_data.amount > invoice.balance_due:
+    if payment_data.amount > balance_due:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
-            detail=f"Payment amount (${payment_data.amount}) exceeds balance due (${invoice.balance_due})"
+            detail=f"Payment amount (${payment_data.amount}) exceeds balance due (${balance_due})"
         )
 
     new_payment = Payment(
+        company_id=invoice.company_id,
         invoice_id=invoice_id,
         amount=payment_data.amount,
         method=payment_data.method,
         reference=payment_data.reference,
         paid_at=payment_data.payment_date or datetime.now()
     )
-    
-    db.add(new_payment)
     db.add(new_payment)
-    
-    invoice.balance_due -= payment_data.amount
-    if invoice.balance_due <= 0:
-        invoice.status = "paid"
-        invoice.balance_due = 0
-    else:
-        # Check overdue status just in case
-        if invoice.due_date and invoice.due_date < date.today():
-             invoice.status = "overdue"
+    payment_ledger.apply_delta(db, invoice, new_payment.amount)
+
+    rollups.record_payment(db, invoice.company_id, invoice.quote.client_id, new_payment.paid_at, new_payment.amount)
+    rollups.track_invoice(db, invoice.company_id, before, rollups.invoice_state(invoice))
 
     db.commit()
+    analytics_cache.invalidate_company(current_user.company_id)
     db.refresh(new_payment)
     return new_payment
 
+def get_payment_with_locked_invoice(db: Session, payment_id: int, company_id: int):
+    """Locks the payment's invoice before reading the payment, so its amount can't change underneath us."""
+    invoice_id = db.scalar(select(Payment.invoice_id).where(Payment.id == payment_id, Payment.company_id == company_id))
+    if invoice_id is None:
+        raise HTTPException(status_code=404, detail="Payment not found")
+    invoice = payment_ledger.lock_invoice(db, invoice_id, company_id)
+    payment = db.query(Payment).filter(Payment.id == payment_id).populate_existing().first()
+    if not payment:
+        raise HTTPException(status_code=404, detail="Payment not found")
+    return payment, invoice
+
 @router.delete("/payments/{payment_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_payment(
     payment_id: int,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: TenantContext = Depends(get_current_tenant)
 ):
-    payment = db.query(Payment).join(Invoice).join(Quote).join(Client).join(UserModel).filter(Payment.id == payment_id, UserModel.company_name == current_user.company_name).first()
-    if not payment:
-         raise HTTPException(status_code=404, detail="Payment not found")
-    
-    invoice = payment.invoice
-    
-    # Delete payment
+    payment, invoice = get_payment_with_locked_invoice(db, payment_id, current_user.company_id)
+
+    before = rollups.invoice_state(invoice)
+    rollups.record_payment(db, invoice.company_id, invoice.quote.client_id, payment.paid_at, payment.amount, sign=-1)
+
     db.delete(payment)
-    db.flush() # Flush to update relationship/database so recalculation sees 1 less payment
-    
-    # Recalculate
-    recalculate_invoice_state(invoice)
+    payment_ledger.apply_delta(db, invoice, -payment.amount)
+    rollups.track_invoice(db, invoice.company_id, before, rollups.invoice_state(invoice))
     
     db.commit()
+    analytics_cache.invalidate_company(current_user.company_id)
     return None
 
 @router.put("/payments/{payment_id}", response_model=PaymentResponse)
@@ -108,19 +90,13 @@ def update_payment(
     payment_id: int,
     payment_update: PaymentCreate,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: TenantContext = Depends(get_current_tenant)
 ):
-    payment = db.query(Payment).join(Invoice).join(Quote).join(Client).join(UserModel).filter(Payment.id == payment_id, UserModel.company_name == current_user.company_name).first()
-    if not payment:
-         raise HTTPException(status_code=404, detail="Payment not found")
-    
-    invoice = payment.invoice
-    
+    payment, invoice = get_payment_with_locked_invoice(db, payment_id, current_user.company_id)
+
     # Check if new amount will exceed balance
-    
-    total_paid_others = sum(p.amount for p in invoice.payments if p.id != payment_id)
-    balance_pending = max(invoice.total - total_paid_others, 0)
-    
+    balance_pending = max(invoice.total - (invoice.total_paid - payment.amount), 0)
+
     if payment_update.amount > balance_pending:
          raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, 
@@ -128,15 +104,22 @@ def update_payment(
         )
 
     # Proceed
+    before = rollups.invoice_state(invoice)
+    client_id = invoice.quote.client_id
+    rollups.record_payment(db, invoice.company_id, client_id, payment.paid_at, payment.amount, sign=-1)
+
+    delta = payment_update.amount - payment.amount
     payment.amount = payment_update.amount
     payment.method = payment_update.method
     payment.reference = payment_update.reference
     if payment_update.payment_date:
         payment.paid_at = payment_update.payment_date
 
-    db.flush() # Update DB
-    recalculate_invoice_state(invoice) # Update Invoice based on new state
+    payment_ledger.apply_delta(db, invoice, delta)
+    rollups.record_payment(db, invoice.company_id, client_id, payment.paid_at, payment.amount)
+    rollups.track_invoice(db, invoice.company_id, before, rollups.invoice_state(invoice))
 
     db.commit()
+    analytics_cache.invalidate_company(current_user.company_id)
     db.refresh(payment)
     return payment
@@ -1,87 +1,210 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session, selectinload
 from typing import List
 from models.quote import Quote
 from models.line_item import LineItem
 from models.client import Client
-from models.user import UserModel
-from serializers.quote import QuoteCreate, QuoteUpdate, QuoteResponse
-from database import get_db
-from dependencies.get_current_user import get_current_user
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-import io
+from models.company import Company
+from serializers.quote import QuoteCreate, QuoteUpdate, QuoteResponse, QuoteBulkCreate, QuoteBulkResult, QuoteBulkResponse
+from serializers.pagination import Page
+from serializers.pdf_archive import PDFArchiveRequest
+from dependencies.filters import QuoteFilters
+from utils.pagination import PageParams, apply_keyset, build_page
+from utils.json_response import FastJSONResponse
+from utils import money
+from services import rollups, analytics_cache, pdf, pdf_cache, pdf_archive, list_rows
+from database import get_db, get_read_db
+from dependencies.get_current_user import get_current_tenant, get_read_tenant, TenantContext
 
 router = APIRouter(prefix="/quotes", tags=["Quotes"])
 
-def calculate_quote_totals(line_items_data):
-    subtotal = 0
-    for item in line_items_data:
-        subtotal += item.quantity * item.rate
-    tax = subtotal * 0.10 # Assuming 10% tax for now, can be parameterized
-    total = subtotal + tax
-    return subtotal, tax, total
+# Loader options matching what QuoteResponse serializes, so a quote costs one
+# query plus one per relationship instead of lazy loads during serialization.
+# The list endpoint builds its rows from columns instead (services/list_rows.py).
+QUOTE_RESPONSE_OPTIONS = (selectinload(Quote.line_items), selectinload(Quote.client))
+
+def calculate_quote_totals(line_items_data, tax_rate=money.DEFAULT_TAX_RATE):
+    totals = money.calculate_totals(line_items_data, tax_rate)
+    return totals.subtotal, totals.tax, totals.total
+
+def company_tax_rate(db: Session, company_id: int):
+    return db.scalar(select(Company.tax_rate).where(Company.id == company_id))
+
+def sync_line_items(db: Session, quote_id: int, line_items):
+    """
+    Brings a quote's line items in line with the submitted list: rows whose
+    values changed are updated, items without an id are inserted and items
+    left out are deleted, one bulk statement each. Unchanged rows are untouched.
+    """
+    existing = {
+        row.id: row
+        for row in db.execute(
+            select(LineItem.id, LineItem.description, LineItem.quantity, LineItem.rate)
+            .where(LineItem.quote_id == quote_id)
+        )
+    }
+
+    to_insert, to_update, kept_ids = [], [], set()
+    for item in line_items:
+        values = {
+            "description": item.description,
+            "quantity": item.quantity,
+            "rate": item.rate,
+            "total": money.line_total(item.quantity, item.rate)
+        }
+        if item.id is None:
+            to_insert.append({"quote_id": quote_id, **values})
+            continue
+
+        current = existing.get(item.id)
+        if current is None:
+            raise HTTPException(status_code=400, detail=f"Line item {item.id} does not belong to this quote")
+        # A repeated id would update one row but be counted twice in the quote totals
+        if item.id in kept_ids:
+            raise HTTPException(status_code=400, detail=f"Line item {item.id} is listed more than once")
+        kept_ids.add(item.id)
+        if (current.description, current.quantity, current.rate) != (item.description, item.quantity, item.rate):
+            to_update.append({"id": item.id, **values})
+
+    to_delete = existing.keys() - kept_ids
+    if to_delete:
+        db.execute(delete(LineItem).where(LineItem.id.in_(sorted(to_delete))))
+    if to_update:
+        db.execute(update(LineItem), to_update)
+    if to_insert:
+        db.execute(insert(LineItem), to_insert)
 
 @router.post("/", response_model=QuoteResponse, status_code=status.HTTP_201_CREATED)
 def create_quote(
     quote: QuoteCreate,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: TenantContext = Depends(get_current_tenant)
 ):
     # Verify client belongs to same company
-    client = db.query(Client).join(UserModel).filter(
-        Client.id == quote.client_id, 
-        UserModel.company_name == current_user.company_name
+    client = db.query(Client).filter(
+        Client.id == quote.client_id,
+        Client.company_id == current_user.company_id
     ).first()
     
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
 
-    subtotal, tax, total = calculate_quote_totals(quote.line_items)
+    tax_rate = company_tax_rate(db, client.company_id)
+    subtotal, tax, total = calculate_quote_totals(quote.line_items, tax_rate)
 
     new_quote = Quote(
+        company_id=client.company_id,
         client_id=quote.client_id,
         expiry_date=quote.expiry_date,
         title=quote.title,
         subtotal=subtotal,
         tax=tax,
+        tax_rate=tax_rate,
         total=total,
-        status="draft"
+        status="draft",
+        line_items=[
+            LineItem(
+                description=item.description,
+                quantity=item.quantity,
+                rate=item.rate,
+                total=money.line_total(item.quantity, item.rate)
+            )
+            for item in quote.line_items
+        ]
     )
     db.add(new_quote)
     db.commit()
     db.refresh(new_quote)
-
-    for item in quote.line_items:
-        line_item_total = item.quantity * item.rate
-        new_line_item = LineItem(
-            quote_id=new_quote.id,
-            description=item.description,
-            quantity=item.quantity,
-            rate=item.rate,
-            total=line_item_total
-        )
-        db.add(new_line_item)
-    
-    db.commit()
-    db.refresh(new_quote)
     return new_quote
 
-@router.get("/", response_model=List[QuoteResponse])
-def get_quotes(
+@router.post("/bulk", response_model=QuoteBulkResponse)
+def create_quotes_bulk(
+    payload: QuoteBulkCreate,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: TenantContext = Depends(get_current_tenant)
 ):
-    quotes = db.query(Quote).join(Client).join(UserModel).filter(UserModel.company_name == current_user.company_name).all()
-    return quotes
+    """
+    Create many quotes and their line items in a single transaction.
+    Items whose client is missing or belongs to another company are reported
+    as failed; the rest are inserted.
+    """
+    client_ids = {quote.client_id for quote in payload.quotes}
+    owned_client_ids = set(db.scalars(
+        select(Client.id).where(Client.id.in_(client_ids), Client.company_id == current_user.company_id)
+    ))
+
+    results = []
+    accepted = []
+    for index, quote in enumerate(payload.quotes):
+        if quote.client_id in owned_client_ids:
+            accepted.append((index, quote))
+        else:
+            results.append(QuoteBulkResult(index=index, error="Client not found"))
+
+    if accepted:
+        tax_rate = company_tax_rate(db, current_user.company_id)
+        quote_rows = []
+        for _, quote in accepted:
+            subtotal, tax, total = calculate_quote_totals(quote.line_items, tax_rate)
+            quote_rows.append({
+                "company_id": current_user.company_id,
+                "client_id": quote.client_id,
+                "expiry_date": quote.expiry_date,
+                "title": quote.title,
+                "subtotal": subtotal,
+                "tax": tax,
+                "tax_rate": tax_rate,
+                "total": total,
+                "status": "draft"
+            })
+        # Batched into multi-row INSERT ... RETURNING; ids come back in parameter order
+        quote_ids = db.scalars(insert(Quote).returning(Quote.id, sort_by_parameter_order=True), quote_rows).all()
+
+        line_item_rows = [
+            {
+                "quote_id": quote_id,
+                "description": item.description,
+                "quantity": item.quantity,
+                "rate": item.rate,
+                "total": money.line_total(item.quantity, item.rate)
+            }
+            for quote_id, (_, quote) in zip(quote_ids, accepted)
+            for item in quote.line_items
+        ]
+        if line_item_rows:
+            db.execute(insert(LineItem), line_item_rows)
+        db.commit()
+
+        results.extend(QuoteBulkResult(index=index, id=quote_id) for quote_id, (index, _) in zip(quote_ids, accepted))
+
+    results.sort(key=lambda result: result.index)
+    return QuoteBulkResponse(created=len(accepted), failed=len(payload.quotes) - len(accepted), results=results)
+
+@router.get("/", response_model=Page[QuoteResponse])
+def get_quotes(
+    page: PageParams = Depends(),
+    filters: QuoteFilters = Depends(),
+    db: Session = Depends(get_read_db),
+    current_user: TenantContext = Depends(get_read_tenant)
+):
+    # Built from column tuples rather than ORM objects; see services/list_rows.py
+    stmt = filters.apply(list_rows.quote_list_statement(current_user.company_id))
+    result = build_page(db.execute(apply_keyset(stmt, Quote, page)), page)
+    quote_ids = [row.id for row in result["items"]]
+    line_items = db.execute(list_rows.line_items_statement(quote_ids)) if quote_ids else []
+    result["items"] = list_rows.quote_rows(result["items"], line_items)
+    return FastJSONResponse(result)
 
 @router.get("/{quote_id}", response_model=QuoteResponse)
 def get_quote(
     quote_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: TenantContext = Depends(get_read_tenant)
 ):
-    quote = db.query(Quote).join(Client).join(UserModel).filter(Quote.id == quote_id, UserModel.company_name == current_user.company_name).first()
+    quote = db.query(Quote).options(*QUOTE_RESPONSE_OPTIONS).filter(Quote.id == quote_id, Quote.company_id == current_user.company_id).first()
     if not quote:
         raise HTTPException(status_code=404, detail="Quote not found")
     return quote
@@ -91,9 +214,9 @@ def update_quote(
     quote_id: int,
     quote_update: QuoteUpdate,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: TenantContext = Depends(get_current_tenant)
 ):
-    quote = db.query(Quote).join(Client).join(UserModel).filter(Quote.id == quote_id, UserModel.company_name == current_user.company_name).first()
+    quote = db.query(Quote).filter(Quote.id == quote_id, Quote.company_id == current_user.company_id).first()
     if not quote:
         raise HTTPException(status_code=404, detail="Quote not found")
 
@@ -103,24 +226,13 @@ def update_quote(
         quote.status = quote_update.status
     
     if quote_update.line_items is not None:
-        db.query(LineItem).filter(LineItem.quote_id == quote.id).delete()
-        
-        subtotal, tax, total = calculate_quote_totals(quote_update.line_items)
+        sync_line_items(db, quote.id, quote_update.line_items)
+
+        subtotal, tax, total = calculate_quote_totals(quote_update.line_items, quote.tax_rate)
         quote.subtotal = subtotal
         quote.tax = tax
         quote.total = total
 
-        for item in quote_update.line_items:
-            line_item_total = item.quantity * item.rate
-            new_line_item = LineItem(
-                quote_id=quote.id,
-                description=item.description,
-                quantity=item.quantity,
-                rate=item.rate,
-                total=line_item_total
-            )
-            db.add(new_line_item)
-
     db.commit()
     db.refresh(quote)
     return quote
@@ -129,23 +241,26 @@ def update_quote(
 def delete_quote(
     quote_id: int,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: TenantContext = Depends(get_current_tenant)
 ):
-    quote = db.query(Quote).join(Client).join(UserModel).filter(Quote.id == quote_id, UserModel.company_name == current_user.company_name).first()
+    quote = db.query(Quote).filter(Quote.id == quote_id, Quote.company_id == current_user.company_id).first()
     if not quote:
         raise HTTPException(status_code=404, detail="Quote not found")
     
+    if quote.invoice:
+        rollups.remove_invoice(db, quote.invoice)
     db.delete(quote)
     db.commit()
+    analytics_cache.invalidate_company(current_user.company_id)
     return None
 
 @router.post("/{quote_id}/send")
 def send_quote(
     quote_id: int,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: TenantContext = Depends(get_current_tenant)
 ):
-    quote = db.query(Quote).join(Client).join(UserModel).filter(Quote.id == quote_id, UserModel.company_name == current_user.company_name).first()
+    quote = db.query(Quote).filter(Quote.id == quote_id, Quote.company_id == current_user.company_id).first()
     if not quote:
         raise HTTPException(status_code=404, detail="Quote not found")
     
@@ -157,9 +272,9 @@ def send_quote(
 def accept_quote(
     quote_id: int,
     db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    current_user: TenantContext = Depends(get_current_tenant)
 ):
-    quote = db.query(Quote).join(Client).join(UserModel).filter(Quote.id == quote_id, UserModel.company_name == current_user.company_name).first()
+    quote = db.query(Quote).filter(Quote.id == quote_id, Quote.company_id == current_user.company_id).first()
     if not quote:
         raise HTTPException(status_code=404, detail="Quote not found")
     
@@ -170,135 +285,37 @@ def accept_quote(
     db.commit()
     return {"message": "Quote accepted"}
 
-@router.get("/{quote_id}/pdf")
-def generate_quote_pdf(
-    quote_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
-):
-    quote = db.query(Quote).join(Client).join(UserModel).filter(Quote.id == quote_id, UserModel.company_name == current_user.company_name).first()
+def load_quote_snapshot(db: Session, quote_id: int, current_user: TenantContext) -> pdf.DocumentSnapshot:
+    quote = db.query(Quote).options(*pdf.QUOTE_PDF_OPTIONS).filter(Quote.id == quote_id, Quote.company_id == current_user.company_id).first()
     if not quote:
         raise HTTPException(status_code=404, detail="Quote not found")
+    return pdf.quote_snapshot(quote, current_user)
 
-    buffer = io.BytesIO()
-    p = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
-    import re
-
-    # Helper for drawing wrapped text? For now, assume simple lines.
-    
-    # --- HEADER ---
-    # Company Info (Left)
-    y = height - 50
-    p.setFont("Helvetica-Bold", 16)
-    company_name = current_user.company_name or "Company Name"
-    p.drawString(50, y, company_name)
-    y -= 20
-    p.setFont("Helvetica", 10)
-    p.drawString(50, y, current_user.email)
-    
-    # Document Info (Right)
-    y_top = height - 50
-    p.setFont("Helvetica-Bold", 24)
-    p.drawRightString(width - 50, y_top, "QUOTE")
-    
-    p.setFont("Helvetica-Bold", 12)
-    p.drawRightString(width - 50, y_top - 30, f"#{quote.id}")
-    
-    p.setFont("Helvetica", 10)
-    p.drawRightString(width - 50, y_top - 45, f"Date: {quote.created_at.strftime('%Y-%m-%d')}")
-    if quote.expiry_date:
-        p.drawRightString(width - 50, y_top - 60, f"Expires: {quote.expiry_date.strftime('%Y-%m-%d')}")
-
-    # --- BILL TO ---
-    y = height - 140
-    p.setFont("Helvetica-Bold", 10)
-    p.drawString(50, y, "BILL TO:")
-    y -= 15
-    p.setFont("Helvetica", 12)
-    p.drawString(50, y, quote.client.name)
-    y -= 15
-    p.setFont("Helvetica", 10)
-    p.drawString(50, y, quote.client.email)
-    if quote.client.phone:
-        y -= 12
-        p.drawString(50, y, quote.client.phone)
-    if quote.client.address:
-        y -= 12
-        p.drawString(50, y, quote.client.address)
-
-    # --- TITLE ---
-    y -= 40
-    p.setFont("Helvetica-Bold", 14)
-    p.drawString(50, y, quote.title)
-
-    # --- TABLE HEADER ---
-    y -= 30
-    p.setLineWidth(1)
-    p.line(50, y, width - 50, y)
-    y -= 15
-    p.setFont("Helvetica-Bold", 10)
-    p.drawString(50, y, "DESCRIPTION")
-    p.drawString(300, y, "QTY")
-    p.drawString(380, y, "RATE")
-    p.drawString(480, y, "AMOUNT")
-    y -= 5
-    p.line(50, y, width - 50, y)
-    
-    # --- TABLE CONTENT ---
-    y -= 20
-    p.setFont("Helvetica", 10)
-    
-    for item in quote.line_items:
-         # Simple check for page break
-        if y < 100:
-            p.showPage()
-            y = height - 50
-            # Redraw headers? simplified for now just continue
-        
-        p.drawString(50, y, item.description)
-        p.drawString(300, y, str(item.quantity))
-        p.drawString(380, y, f"${item.rate:,.2f}")
-        p.drawString(480, y, f"${item.total:,.2f}")
-        y -= 20
-
-    # --- TOTALS ---
-    y -= 10
-    p.line(300, y, width - 50, y)
-    y -= 20
-    
-    p.setFont("Helvetica-Bold", 10)
-    p.drawString(380, y, "Subtotal:")
-    p.drawRightString(width - 50, y, f"${quote.subtotal:,.2f}")
-    y -= 15
-    
-    p.drawString(380, y, "Tax (10%):")
-    p.drawRightString(width - 50, y, f"${quote.tax:,.2f}")
-    y -= 15
-    
-    p.setFillColorRGB(0.9, 0.9, 0.9) # Light gray background for total
-    p.rect(370, y - 5, width - 50 - 370, 20, fill=1, stroke=0)
-    p.setFillColorRGB(0, 0, 0)
-    
-    p.setFont("Helvetica-Bold", 12)
-    p.drawString(380, y, "Total:")
-    p.drawRightString(width - 50, y, f"${quote.total:,.2f}")
-    
-    # --- FOOTER ---
-    p.setFont("Helvetica", 9)
-    p.setFillColorRGB(0.5, 0.5, 0.5)
-    
-    # Prepared By
-    p.drawString(50, 50, f"Prepared by: {current_user.username}")
-    p.drawCentredString(width / 2, 30, "Thank you for your business!")
+@router.get("/{quote_id}/pdf")
+async def generate_quote_pdf(
+    quote_id: int,
+    if_none_match: str = Header(None),
+    db: Session = Depends(get_read_db),
+    current_user: TenantContext = Depends(get_read_tenant)
+):
+    # Loading runs in the threadpool; the render is awaited so it holds no thread while the pool works
+    snapshot = await run_in_threadpool(load_quote_snapshot, db, quote_id, current_user)
+    return await pdf_cache.cached_pdf_response(snapshot, if_none_match)
 
-    p.showPage()
-    p.save()
+@router.post("/pdf-archive")
+def download_quote_pdf_archive(
+    archive_request: PDFArchiveRequest,
+    db: Session = Depends(get_read_db),
+    current_user: TenantContext = Depends(get_read_tenant)
+):
+    """Stream a ZIP of quote PDFs, chosen by id or by issue date range and status."""
+    ids = pdf_archive.matching_ids(db, "quotes", current_user.company_id, archive_request)
+    if not ids:
+        raise HTTPException(status_code=404, detail="No quotes found")
 
-    buffer.seek(0)
-    
-    # Filename sanitization
-    safe_title = re.sub(r'[^a-zA-Z0-9_\-]', '_', quote.title)
-    filename = f"{safe_title}_{quote.id}.pdf"
-    
-    return Response(content=buffer.getvalue(), media_type="application/pdf", headers={"Content-Disposition": f'attachment; filename="{filename}"'})
\ No newline at end of file
+    filename = f"quotes_{archive_request.start or 'all'}_{archive_request.end or 'all'}.zip"
+    return StreamingResponse(
+        pdf_archive.stream_archive("quotes", ids, current_user),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
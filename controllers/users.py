@@ -1,14 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from models.user import UserModel
+from models.company import Company
 from serializers.user import UserSchema, UserLogin, UserToken, UserResponseSchema, UserUpdate, UserPasswordUpdate
-from dependencies.get_current_user import get_current_user
+from dependencies.get_current_user import get_current_user, invalidate_user
 from database import get_db
+from services import invoice_numbers
+from utils.passwords import password_hasher
 
 router = APIRouter()
 
-@router.post("/sign-up", response_model=UserResponseSchema)
-def create_user(user: UserSchema, db: Session = Depends(get_db)):
+def get_or_create_company(db: Session, company_name: str) -> Company:
+    query = db.query(Company).filter(Company.name == company_name)
+    company = query.first()
+    if not company:
+        # Concurrent sign-ups for a new company race on the insert, not on the unique name
+        dialect = db.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        db.execute(insert(Company).values(name=company_name).on_conflict_do_nothing(index_elements=["name"]))
+        company = query.one()
+    return company
+
+def check_sign_up(db: Session, user: UserSchema):
     existing_user = db.query(UserModel).filter(
         (UserModel.username == user.username) | (UserModel.email == user.email)
     ).first()
@@ -25,29 +40,48 @@ def create_user(user: UserSchema, db: Session = Depends(get_db)):
         if existing_owner:
             raise HTTPException(status_code=400, detail="This company already has an owner account.")
 
+def insert_user(db: Session, user: UserSchema, password_hash: str) -> UserResponseSchema:
+    company = get_or_create_company(db, user.company_name)
+
     new_user = UserModel(
         username=user.username,
         email=user.email,
         role=user.role or "owner",
-        company_name=user.company_name 
+        company_name=company.name,
+        company_id=company.id,
+        password_hash=password_hash
     )
-    new_user.set_password(user.password)
 
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    # Serialized here, while lazy loads (company for tax_rate) can still run on this thread
+    return UserResponseSchema.model_validate(new_user)
 
-    return new_user
+# The password endpoints are async so that waiting for bcrypt in the process pool
+# holds no request threadpool slot; their database work goes through run_in_threadpool.
+@router.post("/sign-up", response_model=UserResponseSchema)
+async def create_user(user: UserSchema, db: Session = Depends(get_db)):
+    await run_in_threadpool(check_sign_up, db, user)
+    password_hash = await password_hasher.hash_async(user.password)
+    return await run_in_threadpool(insert_user, db, user, password_hash)
 
 
 @router.post("/sign-in", response_model=UserToken)
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(UserModel).filter(UserModel.username == user.username).first()
+async def login(user: UserLogin, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(lambda: db.query(UserModel).filter(UserModel.username == user.username).first())
 
-    if not db_user or not db_user.verify_password(user.password):
+    if not db_user or not await db_user.verify_password_async(user.password):
         raise HTTPException(status_code=400, detail="Invalid username or password")
 
+    # Issued before any commit, which would expire the attributes it reads
     token = db_user.generate_token()
+
+    # Transparently upgrade hashes made with an older bcrypt cost
+    if db_user.password_needs_rehash():
+        await db_user.set_password_async(user.password)
+        await run_in_threadpool(db.commit)
+
     return {"token": token, "message": "Login successful"}
 
 @router.put("/me", response_model=UserResponseSchema)
@@ -70,22 +104,33 @@ def update_user_me(
             raise HTTPException(status_code=400, detail="Email already exists")
         current_user.email = user_update.email
         
-    if user_update.company_name:
-        current_user.company_name = user_update.company_name
+    if user_update.company_name and user_update.company_name != current_user.company_name:
+        # Clients, quotes and invoices belong to the company, so a user can't take them elsewhere
+        raise HTTPException(status_code=400, detail="The company name can't be changed")
+
+    if user_update.tax_rate is not None:
+        # Applies to quotes created from now on; existing quotes keep the rate they were priced at
+        db.get(Company, current_user.company_id).tax_rate = user_update.tax_rate
+
+    if user_update.invoice_prefix is not None:
+        invoice_numbers.set_prefix(db, current_user.company_id, user_update.invoice_prefix)
 
     db.commit()
     db.refresh(current_user)
+    invalidate_user(current_user.id)
     return current_user
 
 @router.put("/me/password")
-def update_password(
+async def update_password(
     password_update: UserPasswordUpdate,
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    if not current_user.verify_password(password_update.current_password):
+    if not await current_user.verify_password_async(password_update.current_password):
         raise HTTPException(status_code=400, detail="Incorrect current password")
-    
-    current_user.set_password(password_update.new_password)
-    db.commit()
+
+    user_id = current_user.id
+    await current_user.set_password_async(password_update.new_password)
+    await run_in_threadpool(db.commit)
+    invalidate_user(user_id)
     return {"message": "Password updated successfully"}
@@ -1,12 +1,98 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, Session
-from config.environment import db_URI
-
-engine = create_engine(
-    db_URI
+from sqlalchemy.pool import QueuePool
+from utils import slow_queries
+from utils.instrumentation import instrument_engine
+from config.environment import (
+    db_URI, db_replica_URI, db_pool_size, db_max_overflow, db_pool_timeout,
+    db_pool_recycle, db_pool_pre_ping, db_statement_timeout_ms, db_application_name, slow_query_log_enabled
 )
 
+
+class PoolMetrics:
+    """Checkout / wait counters for one engine's connection pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self.lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter: str):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    metrics: PoolMetrics = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+pool_metrics = {}
+
+
+def create_db_engine(url: str, name: str = "primary"):
+    """Build an engine from the DB_* settings and attach pool metrics to it."""
+    metrics = pool_metrics[name] = PoolMetrics(name)
+
+    if url.startswith("sqlite"):
+        engine = create_engine(url, pool_pre_ping=db_pool_pre_ping)
+    else:
+        connect_args = {"application_name": db_application_name}
+        if db_statement_timeout_ms:
+            connect_args["options"] = f"-c statement_timeout={db_statement_timeout_ms}"
+
+        poolclass = type(f"TimedQueuePool_{name}", (TimedQueuePool,), {"metrics": metrics})
+        engine = create_engine(
+            url,
+            poolclass=poolclass,
+            pool_size=db_pool_size,
+            max_overflow=db_max_overflow,
+            pool_timeout=db_pool_timeout,
+            pool_recycle=db_pool_recycle,
+            pool_pre_ping=db_pool_pre_ping,
+            connect_args=connect_args
+        )
+
+    event.listen(engine, "checkout", lambda *args: metrics.increment("checkouts"))
+    event.listen(engine, "connect", lambda *args: metrics.increment("connects"))
+    event.listen(engine, "invalidate", lambda *args: metrics.increment("invalidations"))
+    instrument_engine(engine)
+    if slow_query_log_enabled:
+        slow_queries.attach(engine)
+    return engine
+
+
+engine = create_db_engine(db_URI, "primary")
+replica_engine = create_db_engine(db_replica_URI, "replica") if db_replica_URI else None
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine else None
 
 
 def get_db():
@@ -15,3 +101,37 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+if ReadSessionLocal:
+    def get_read_db():
+        """Session bound to the read replica, for GET endpoints and analytics."""
+        db = ReadSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+else:
+    # Without a replica, reuse get_db itself so FastAPI shares one session per request
+    get_read_db = get_db
+
+
+def pool_stats():
+    stats = {}
+    for name, db_engine in (("primary", engine), ("replica", replica_engine)):
+        if db_engine is None:
+            continue
+        metrics = pool_metrics[name]
+        pool = db_engine.pool
+        stats[name] = {
+            "size": pool.size() if hasattr(pool, "size") else None,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+            "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+            "checkouts": metrics.checkouts,
+            "connects": metrics.connects,
+            "invalidations": metrics.invalidations,
+            "timeouts": metrics.timeouts,
+            "wait_seconds_total": round(metrics.wait_seconds_total, 6),
+            "wait_seconds_max": round(metrics.wait_seconds_max, 6),
+        }
+    return stats
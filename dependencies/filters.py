@@ -0,0 +1,95 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import select
+from models.client import Client
+from models.quote import Quote
+from models.invoice import Invoice
+
+
+def _created_range(query, model, created_from: Optional[date], created_to: Optional[date]):
+    # Date bounds are inclusive; compare against day boundaries so the created_at index is usable
+    if created_from:
+        query = query.filter(model.created_at >= datetime.combine(created_from, time.min))
+    if created_to:
+        query = query.filter(model.created_at < datetime.combine(created_to + timedelta(days=1), time.min))
+    return query
+
+
+class ClientFilters:
+    def __init__(
+        self,
+        created_from: Optional[date] = None,
+        created_to: Optional[date] = None
+    ):
+        self.created_from = created_from
+        self.created_to = created_to
+
+    def apply(self, query):
+        return _created_range(query, Client, self.created_from, self.created_to)
+
+
+class QuoteFilters:
+    def __init__(
+        self,
+        status: Optional[str] = None,
+        client_id: Optional[int] = None,
+        created_from: Optional[date] = None,
+        created_to: Optional[date] = None,
+        min_total: Optional[Decimal] = None,
+        max_total: Optional[Decimal] = None
+    ):
+        self.status = status
+        self.client_id = client_id
+        self.created_from = created_from
+        self.created_to = created_to
+        self.min_total = min_total
+        self.max_total = max_total
+
+    def apply(self, query):
+        if self.status:
+            query = query.filter(Quote.status == self.status)
+        if self.client_id:
+            query = query.filter(Quote.client_id == self.client_id)
+        if self.min_total is not None:
+            query = query.filter(Quote.total >= self.min_total)
+        if self.max_total is not None:
+            query = query.filter(Quote.total <= self.max_total)
+        return _created_range(query, Quote, self.created_from, self.created_to)
+
+
+class InvoiceFilters:
+    def __init__(
+        self,
+        status_filter: Optional[str] = None,
+        client_id: Optional[int] = None,
+        created_from: Optional[date] = None,
+        created_to: Optional[date] = None,
+        due_from: Optional[date] = None,
+        due_to: Optional[date] = None,
+        min_total: Optional[Decimal] = None,
+        max_total: Optional[Decimal] = None
+    ):
+        self.status = status_filter
+        self.client_id = client_id
+        self.created_from = created_from
+        self.created_to = created_to
+        self.due_from = due_from
+        self.due_to = due_to
+        self.min_total = min_total
+        self.max_total = max_total
+
+    def apply(self, query):
+        if self.status:
+            query = query.filter(Invoice.status == self.status)
+        if self.client_id:
+            query = query.filter(Invoice.quote_id.in_(select(Quote.id).where(Quote.client_id == self.client_id)))
+        if self.due_from:
+            query = query.filter(Invoice.due_date >= self.due_from)
+        if self.due_to:
+            query = query.filter(Invoice.due_date <= self.due_to)
+        if self.min_total is not None:
+            query = query.filter(Invoice.total >= self.min_total)
+        if self.max_total is not None:
+            query = query.filter(Invoice.total <= self.max_total)
+        return _created_range(query, Invoice, self.created_from, self.created_to)
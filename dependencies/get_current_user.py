@@ -1,5 +1,5 @@
-
-
+import logging
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from sqlalchemy.orm import Session
@@ -7,20 +7,52 @@ from models.user import UserModel
 from database import get_db
 import jwt
 from jwt import DecodeError, ExpiredSignatureError # We import specific exceptions to handle them explicitly
-from config.environment import secret
+from config.environment import secret, auth_cache_ttl, auth_cache_size, auth_trust_token_claims, web_concurrency
+from utils.cache import TTLCache
 
 http_bearer = HTTPBearer()
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(http_bearer)):
+@dataclass(frozen=True)
+class TenantContext:
+    """The parts of the signed-in user that tenant-scoped endpoints need."""
+    id: int
+    username: str
+    email: str
+    role: str
+    company_id: int
+    company_name: str
 
-    try:
-        payload = jwt.decode(token.credentials, secret, algorithms=["HS256"])
+    @classmethod
+    def from_user(cls, user: UserModel):
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            role=user.role or "owner",
+            company_id=user.company_id,
+            company_name=user.company_name
+        )
 
-        user = db.query(UserModel).filter(UserModel.id == payload.get("sub")).first()
+logger = logging.getLogger(__name__)
 
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
-                                 detail="Invalid username or password")
+def create_tenant_cache() -> TTLCache:
+    if web_concurrency > 1:
+        # invalidate_user only reaches this process; other workers would keep a stale company_id for up to the TTL
+        logger.warning("The auth cache is per process and %d workers are configured; it is off", web_concurrency)
+        return TTLCache(maxsize=0, ttl=auth_cache_ttl)  # holds nothing, every lookup misses
+    return TTLCache(maxsize=auth_cache_size, ttl=auth_cache_ttl)
+
+# Keyed by (sub, iat) so a re-issued token always resolves fresh
+tenant_cache = create_tenant_cache()
+
+def invalidate_user(user_id: int):
+    """Drop cached contexts for a user after their profile or password changes."""
+    sub = str(user_id)
+    tenant_cache.delete_where(lambda key: key[0] == sub)
+
+def decode_token(token) -> dict:
+    try:
+        return jwt.decode(token.credentials, secret, algorithms=["HS256"])
 
     except DecodeError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
@@ -30,4 +62,59 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(http_be
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                              detail='Token has expired')
 
-    return user
\ No newline at end of file
+def tenant_from_claims(payload: dict):
+    """Build a context straight from the token, or None for tokens issued before company_id was embedded."""
+    if payload.get("company_id") is None:
+        return None
+    return TenantContext(
+        id=int(payload["sub"]),
+        username=payload.get("username"),
+        email=payload.get("email"),
+        role=payload.get("role"),
+        company_id=payload["company_id"],
+        company_name=payload.get("company_name")
+    )
+
+def get_current_user(db: Session = Depends(get_db), token: str = Depends(http_bearer)):
+    """Full ORM user, for endpoints that modify the user themselves."""
+
+    payload = decode_token(token)
+
+    user = db.query(UserModel).filter(UserModel.id == payload.get("sub")).first()
+
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
+                             detail="Invalid username or password")
+
+    return user
+
+def get_current_tenant(db: Session = Depends(get_db), token: str = Depends(http_bearer)):
+    """Tenant context for the token, served from the in-process cache when possible."""
+
+    payload = decode_token(token)
+    cache_key = (str(payload.get("sub")), payload.get("iat"))
+
+    tenant = tenant_cache.get(cache_key)
+    if tenant is None:
+        user = db.query(UserModel).filter(UserModel.id == payload.get("sub")).first()
+
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
+                                 detail="Invalid username or password")
+
+        tenant = TenantContext.from_user(user)
+        tenant_cache.set(cache_key, tenant)
+
+    return tenant
+
+def get_read_tenant(db: Session = Depends(get_db), token: str = Depends(http_bearer)):
+    """
+    Tenant context for read-only endpoints. With AUTH_TRUST_TOKEN_CLAIMS enabled the
+    signed claims are used as-is and no database lookup happens at all.
+    """
+    if auth_trust_token_claims:
+        tenant = tenant_from_claims(decode_token(token))
+        if tenant is not None:
+            return tenant
+
+    return get_current_tenant(db, token)
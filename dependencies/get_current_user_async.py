@@ -0,0 +1,31 @@
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user import UserModel
+from async_database import get_async_db
+from config.environment import auth_trust_token_claims
+from dependencies.get_current_user import http_bearer, decode_token, tenant_cache, tenant_from_claims, TenantContext
+
+async def get_read_tenant_async(db: AsyncSession = Depends(get_async_db), token: str = Depends(http_bearer)):
+    """Async counterpart of get_read_tenant, sharing its cache."""
+
+    payload = decode_token(token)
+
+    if auth_trust_token_claims:
+        tenant = tenant_from_claims(payload)
+        if tenant is not None:
+            return tenant
+
+    cache_key = (str(payload.get("sub")), payload.get("iat"))
+    tenant = tenant_cache.get(cache_key)
+    if tenant is None:
+        user = await db.scalar(select(UserModel).where(UserModel.id == payload.get("sub")))
+
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
+                                 detail="Invalid username or password")
+
+        tenant = TenantContext.from_user(user)
+        tenant_cache.set(cache_key, tenant)
+
+    return tenant
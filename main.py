@@ -1,4 +1,8 @@
+import asyncio
+import importlib
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from controllers.quotes import router as QuotesRouter
 from controllers.clients import router as ClientsRouter
@@ -7,14 +11,27 @@ from controllers.payments import router as PaymentsRouter
 from controllers.analytics import router as AnalyticsRouter
 from controllers.users import router as UserRouter
 from models.base import Base
-from database import engine
+from database import engine, pool_stats
+from config.environment import async_routers, status_jobs_interval, metrics_enabled, server_timing_enabled, slow_query_log_enabled, profiler_enabled
+from services import status_jobs
+from utils import instrumentation
 
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduler = asyncio.create_task(status_jobs.run_periodically(status_jobs_interval)) if status_jobs_interval else None
+    yield
+    if scheduler:
+        scheduler.cancel()
+
+
 app = FastAPI(
     title="Quote Management API",
     description="A quote management system API built with FastAPI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 origins = [
@@ -31,6 +48,21 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
+if profiler_enabled:
+    from utils.profiler import ProfilerMiddleware
+    app.add_middleware(ProfilerMiddleware)
+
+# Added last so it wraps everything else, CORS included. The slow-query log
+# also relies on it to attribute statements to routes.
+if metrics_enabled or slow_query_log_enabled:
+    app.add_middleware(instrumentation.InstrumentationMiddleware, server_timing=server_timing_enabled)
+
+# Async read routes are registered first so they take precedence over the
+# matching sync GET routes; writes keep going through the sync routers.
+for router_name in async_routers:
+    async_module = importlib.import_module(f"controllers.async_{router_name}")
+    app.include_router(async_module.router, prefix="/api")
+
 app.include_router(QuotesRouter, prefix="/api", tags=["Quotes"])
 app.include_router(ClientsRouter, prefix="/api", tags=["Clients"])
 app.include_router(InvoicesRouter, prefix="/api", tags=["Invoices"])
@@ -41,4 +73,16 @@ app.include_router(UserRouter, prefix="/api")
 
 @app.get('/')
 def home():
-    return {'message': 'Welcome to Quote Management API! Visit /docs for API documentation.'}
\ No newline at end of file
+    return {'message': 'Welcome to Quote Management API! Visit /docs for API documentation.'}
+
+
+@app.get('/health/db')
+def db_health():
+    return {'pools': pool_stats()}
+
+
+@app.get('/metrics', include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint: per-route request, SQL and response-size counters plus pool gauges."""
+    body = instrumentation.registry.render() + instrumentation.render_pool_stats(pool_stats())
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
@@ -1,6 +1,6 @@
 from .base import BaseModel
 
-from . import user, client, quote, line_item, invoice, payment
+from . import company, user, client, quote, line_item, invoice, invoice_sequence, payment, analytics_rollup, job_run
 
 
 __all__ = ["BaseModel"]
\ No newline at end of file
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, Numeric, Date, ForeignKey, UniqueConstraint
+from models.base import BaseModel
+
+# Per-company aggregates kept up to date by services/rollups.py from the
+# payment and invoice write paths, so the analytics summary reads a handful
+# of small rows instead of scanning the full payment/invoice history.
+
+class RevenueDaily(BaseModel):
+    __tablename__ = "revenue_daily"
+    __table_args__ = (
+        UniqueConstraint("company_id", "day", name="uq_revenue_daily_company_id_day"),
+    )
+
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    total = Column(Numeric(14, 2), default=0, nullable=False)
+
+
+class RevenueByClient(BaseModel):
+    __tablename__ = "revenue_by_client"
+    __table_args__ = (
+        UniqueConstraint("company_id", "client_id", name="uq_revenue_by_client_company_id_client_id"),
+    )
+
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    client_id = Column(Integer, ForeignKey("clients.id", ondelete="CASCADE"), nullable=False)
+    total = Column(Numeric(14, 2), default=0, nullable=False)
+
+
+class InvoiceDueRollup(BaseModel):
+    """Outstanding balance and open invoice count per due date; overdue = buckets before today."""
+    __tablename__ = "invoice_due_rollups"
+    __table_args__ = (
+        UniqueConstraint("company_id", "due_date", name="uq_invoice_due_rollups_company_id_due_date"),
+    )
+
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    due_date = Column(Date, nullable=False)
+    outstanding = Column(Numeric(14, 2), default=0, nullable=False)
+    open_count = Column(Integer, default=0, nullable=False)
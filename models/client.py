@@ -1,11 +1,19 @@
-from sqlalchemy import Column, String, ForeignKey, Integer
+from sqlalchemy import Column, String, ForeignKey, Integer, Index, DateTime, func
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
 
 class Client(BaseModel):
     __tablename__ = "clients"
-    
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    __table_args__ = (
+        Index("ix_clients_company_id_email", "company_id", "email"),
+        Index("ix_clients_company_id_created_at_id", "company_id", "created_at", "id"),
+    )
+
+    # Keyset pagination seeks on (created_at, id), so it is never NULL here
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     email = Column(String(255), unique=True, nullable=False)
     phone = Column(String(50), nullable=True)
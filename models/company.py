@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, Numeric
+from sqlalchemy.orm import relationship
+from models.base import BaseModel
+from utils.money import DEFAULT_TAX_RATE
+
+class Company(BaseModel):
+    __tablename__ = "companies"
+
+    name = Column(String, nullable=False, unique=True)
+    tax_rate = Column(Numeric(5, 4), default=DEFAULT_TAX_RATE, server_default="0.1000", nullable=False)
+
+    users = relationship("UserModel", back_populates="company")
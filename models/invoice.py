@@ -1,12 +1,22 @@
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, Date, Index, UniqueConstraint, DateTime, func
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
 
 class Invoice(BaseModel):
     __tablename__ = "invoices"
+    __table_args__ = (
+        UniqueConstraint("company_id", "invoice_number", name="uq_invoices_company_id_invoice_number"),
+        Index("ix_invoices_company_id_status_due_date", "company_id", "status", "due_date"),
+        Index("ix_invoices_company_id_due_date", "company_id", "due_date"),
+        Index("ix_invoices_company_id_created_at_id", "company_id", "created_at", "id"),
+    )
 
+    # Keyset pagination seeks on (created_at, id), so it is never NULL here
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
     quote_id = Column(Integer, ForeignKey("quotes.id"), nullable=False, unique=True)
-    invoice_number = Column(String, unique=True, nullable=False)
+    invoice_number = Column(String, nullable=False)
     title = Column(String, nullable=False)
     due_date = Column(Date, nullable=False)
     status = Column(String(50), default="sent", nullable=False) # sent, paid, overdue
@@ -14,6 +24,8 @@ class Invoice(BaseModel):
     tax = Column(Numeric(10, 2), nullable=False)
     total = Column(Numeric(10, 2), nullable=False)
     balance_due = Column(Numeric(10, 2), nullable=False)
+    # Running sum of payments, maintained by services/payment_ledger.py
+    total_paid = Column(Numeric(10, 2), default=0, server_default="0", nullable=False)
 
     quote = relationship("Quote", back_populates="invoice")
     payments = relationship("Payment", back_populates="invoice", cascade="all, delete-orphan")
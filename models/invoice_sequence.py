@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from models.base import BaseModel
+
+class InvoiceSequence(BaseModel):
+    """Per-company invoice counter; the row is locked while a number is allocated."""
+    __tablename__ = "invoice_sequences"
+
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, unique=True)
+    prefix = Column(String(20), nullable=False)
+    next_value = Column(Integer, default=1, nullable=False)
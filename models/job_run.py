@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from models.base import BaseModel
+
+class JobRun(BaseModel):
+    """One execution of a background job (see services/status_jobs.py)."""
+    __tablename__ = "job_runs"
+
+    job = Column(String(100), nullable=False, index=True)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+    duration_ms = Column(Integer, nullable=True)
+    rows_updated = Column(Integer, default=0, nullable=False)
+    companies = Column(Integer, default=0, nullable=False)
+    batches = Column(Integer, default=0, nullable=False)
+    status = Column(String(20), nullable=False) # running, succeeded, failed
+    error = Column(Text, nullable=True)
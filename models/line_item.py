@@ -5,7 +5,7 @@ from models.base import BaseModel
 class LineItem(BaseModel):
     __tablename__ = "line_items"
 
-    quote_id = Column(Integer, ForeignKey("quotes.id"), nullable=False)
+    quote_id = Column(Integer, ForeignKey("quotes.id"), nullable=False, index=True)
     description = Column(String, nullable=False)
     quantity = Column(Integer, default=1, nullable=False)
     rate = Column(Numeric(10, 2), nullable=False)
@@ -1,11 +1,15 @@
-from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
 
 class Payment(BaseModel):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_company_id_paid_at", "company_id", "paid_at"),
+    )
 
-    invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False, index=True)
     amount = Column(Numeric(10, 2), nullable=False)
     method = Column(String(50), nullable=False) # bank, stripe, paypal, cash
     reference = Column(String(255), nullable=True) # Transaction ID etc.
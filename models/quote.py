@@ -1,14 +1,25 @@
-from sqlalchemy import Column, Integer, Numeric, Date, String, ForeignKey
+from sqlalchemy import Column, Integer, Numeric, Date, String, ForeignKey, Index, DateTime, func
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
+from utils.money import DEFAULT_TAX_RATE
 
 class Quote(BaseModel):
     __tablename__ = "quotes"
-    
-    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)
+    __table_args__ = (
+        Index("ix_quotes_company_id_status", "company_id", "status"),
+        Index("ix_quotes_company_id_created_at_id", "company_id", "created_at", "id"),
+    )
+
+    # Keyset pagination seeks on (created_at, id), so it is never NULL here
+    created_at = Column(DateTime, default=func.now(), nullable=False)
+
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
+    client_id = Column(Integer, ForeignKey("clients.id"), nullable=False, index=True)
     status = Column(String(50), default="draft", nullable=False)
     subtotal = Column(Numeric(10, 2), nullable=False)
     tax = Column(Numeric(10, 2), default=0, nullable=False)
+    # Rate the tax was calculated at, so later changes to the company rate don't rewrite history
+    tax_rate = Column(Numeric(5, 4), default=DEFAULT_TAX_RATE, server_default="0.1000", nullable=False)
     total = Column(Numeric(10, 2), nullable=False)
     expiry_date = Column(Date, nullable=True)
     title = Column(String, nullable=False)
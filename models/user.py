@@ -1,12 +1,11 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
 from .base import Base
 from sqlalchemy.orm import relationship
-from passlib.context import CryptContext
 from datetime import datetime, timezone, timedelta
 import jwt
 from config.environment import secret
+from utils.passwords import password_hasher
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 class UserModel(Base):
     __tablename__ = "users"
@@ -17,16 +16,31 @@ class UserModel(Base):
     password_hash = Column(String, nullable=True)
     role = Column(String, nullable=True)
     company_name = Column(String, nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
     updated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
 
+    company = relationship("Company", back_populates="users")
     clients = relationship("Client", back_populates="user")
 
+    @property
+    def tax_rate(self):
+        return self.company.tax_rate if self.company else None
+
     def set_password(self, password: str):
-        self.password_hash = pwd_context.hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def verify_password(self, password: str) -> bool:
-        return pwd_context.verify(password, self.password_hash)
+        return password_hasher.verify(password, self.password_hash)
+
+    async def set_password_async(self, password: str):
+        self.password_hash = await password_hasher.hash_async(password)
+
+    async def verify_password_async(self, password: str) -> bool:
+        return await password_hasher.verify_async(password, self.password_hash)
+
+    def password_needs_rehash(self) -> bool:
+        return password_hasher.needs_rehash(self.password_hash)
 
     def generate_token(self):
         payload = {
@@ -36,7 +50,8 @@ class UserModel(Base):
             "username": self.username,
             "role": self.role or "owner",
             "email": self.email,
-            "company_name": self.company_name
+            "company_name": self.company_name,
+            "company_id": self.company_id
         }
         token = jwt.encode(payload, secret, algorithm="HS256")
         return token
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import sessionmaker
 from models.base import Base
-from data.user_data import user_list
+import models
+from benchmarks.dataset import BENCH_PASSWORD, DatasetSpec, generate
 from config.environment import db_URI
 from sqlalchemy import create_engine
 
@@ -15,11 +16,13 @@ try:
     print("Seeding the database...")
     db = SessionLocal()
 
-    db.add_all(user_list)
-    db.commit()
+    spec = DatasetSpec(companies=2, clients=5, quotes=3, line_items=3)
+    counts = generate(db, spec)
 
     db.close()
 
+    print(", ".join(f"{value} {key}" for key, value in counts.items()))
+    print(f"Sign in as bench_1 or bench_2 with password '{BENCH_PASSWORD}'")
     print("Database seeding complete! 👋")
 except Exception as e:
     print("An error occurred:", e)
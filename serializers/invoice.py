@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import date, datetime
 from typing import Optional
+from utils.money import Money
 
 class InvoiceBase(BaseModel):
     quote_id: int
@@ -22,10 +23,10 @@ from serializers.payment import PaymentResponse
 class InvoiceResponse(InvoiceBase):
     id: int
     invoice_number: str
-    subtotal: float
-    tax: float
-    total: float
-    balance_due: float
+    subtotal: Money
+    tax: Money
+    total: Money
+    balance_due: Money
     created_at: datetime
     updated_at: Optional[datetime] = None
     payments: List[PaymentResponse] = []
@@ -1,10 +1,10 @@
 from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
-from decimal import Decimal
+from utils.money import Money
 
 class PaymentBase(BaseModel):
-    amount: Decimal
+    amount: Money
     method: str
     reference: Optional[str] = None
     payment_date: Optional[datetime] = None
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import List, Optional
+
+class PDFArchiveRequest(BaseModel):
+    # Either explicit ids, or a filter on the document's issue date and status
+    ids: Optional[List[int]] = None
+    start: Optional[date] = None
+    end: Optional[date] = None
+    status: Optional[str] = None
@@ -1,19 +1,24 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date, datetime
 from typing import List, Optional
+from utils.money import Money, TaxRate
 
 class LineItemBase(BaseModel):
     description: str
     quantity: int
-    rate: float
+    rate: Money
 
 class LineItemCreate(LineItemBase):
     pass
 
+class LineItemUpdate(LineItemBase):
+    # Existing items keep their id; items without one are added
+    id: Optional[int] = None
+
 class LineItemResponse(LineItemBase):
     id: int
     quote_id: int
-    total: float
+    total: Money
 
     class Config:
         from_attributes = True
@@ -30,20 +35,34 @@ class QuoteUpdate(BaseModel):
     expiry_date: Optional[date] = None
     title: Optional[str] = None
     status: Optional[str] = None
-    line_items: Optional[List[LineItemCreate]] = None
+    line_items: Optional[List[LineItemUpdate]] = None
 
 from serializers.client import ClientResponse
 
 class QuoteResponse(QuoteBase):
     id: int
     status: str
-    subtotal: float
-    tax: float
-    total: float
+    subtotal: Money
+    tax: Money
+    tax_rate: TaxRate
+    total: Money
     created_at: datetime
     updated_at: Optional[datetime] = None
     line_items: List[LineItemResponse] = []
     client: Optional[ClientResponse] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class QuoteBulkCreate(BaseModel):
+    quotes: List[QuoteCreate] = Field(..., min_length=1, max_length=1000)
+
+class QuoteBulkResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class QuoteBulkResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[QuoteBulkResult]
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
+from utils.money import TaxRate
 
 class UserSchema(BaseModel):
     username: str
@@ -15,6 +16,8 @@ class UserUpdate(BaseModel):
     username: str | None = None
     email: str | None = None
     company_name: str | None = None
+    tax_rate: TaxRate | None = Field(None, ge=0, lt=1)
+    invoice_prefix: str | None = Field(None, min_length=1, max_length=20)
 
 class UserPasswordUpdate(BaseModel):
     current_password: str
@@ -25,6 +28,7 @@ class UserResponseSchema(BaseModel):
     email: str
     role: str | None = None
     company_name: str | None = None
+    tax_rate: TaxRate | None = None
     created_at: datetime | None = None
     updated_at: datetime | None = None
 
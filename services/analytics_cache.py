@@ -0,0 +1,54 @@
+"""
+Versioned caching for the analytics summary.
+
+Each company has a version counter that write paths bump after committing a
+payment or invoice change. Cache keys embed the version (and the date, since
+"this month" and "overdue" move with the calendar), so stale entries are
+never read again and simply age out of the backend. Counters start from the
+clock rather than 0, so one that is lost (a restart, a Redis eviction) never
+comes back to a version whose entries may still be cached.
+
+The ETag is a hash of the summary itself, so it only matches when the data
+a client holds is byte-for-byte what it would get now, whichever worker or
+process served it.
+"""
+import datetime
+import hashlib
+import json
+import time
+from utils.cache import cache
+
+
+def _version_key(company_id: int) -> str:
+    return f"analytics:version:{company_id}"
+
+
+def _initial_version() -> int:
+    return time.time_ns() // 1000
+
+
+def invalidate_company(company_id: int):
+    cache.incr(_version_key(company_id), _initial_version())
+
+
+def summary_cache_key(company_id: int) -> str:
+    version = cache.get_counter(_version_key(company_id), _initial_version())
+    return f"analytics:summary:{company_id}:{version}:{datetime.date.today().isoformat()}"
+
+
+def summary_etag(summary) -> str:
+    payload = json.dumps(summary, sort_keys=True, separators=(",", ":")).encode()
+    return f'"{hashlib.sha256(payload).hexdigest()[:32]}"'
+
+
+def cache_summary(cache_key: str, summary) -> dict:
+    """Stores a JSON-ready summary with its ETag; returns the cache entry."""
+    entry = {"summary": summary, "etag": summary_etag(summary)}
+    cache.set(cache_key, entry)
+    return entry
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
@@ -0,0 +1,132 @@
+"""
+Streaming CSV / NDJSON exports.
+
+Rows are read through a server-side cursor (yield_per) and written out one
+partition at a time, optionally through a streaming gzip compressor, so
+memory use stays flat no matter how many years of history are exported.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from sqlalchemy import select
+from database import SessionLocal, ReadSessionLocal
+from models.client import Client
+from models.invoice import Invoice
+from models.line_item import LineItem
+from models.payment import Payment
+from models.quote import Quote
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def _payments(company_id: int):
+    stmt = select(
+        Payment.id.label("payment_id"),
+        Payment.paid_at,
+        Payment.amount,
+        Payment.method,
+        Payment.reference,
+        Invoice.invoice_number,
+        Client.name.label("client_name")
+    ).join(Invoice, Payment.invoice_id == Invoice.id).join(Quote, Invoice.quote_id == Quote.id).join(Client, Quote.client_id == Client.id)
+    return stmt.where(Payment.company_id == company_id).order_by(Payment.paid_at, Payment.id), Payment.paid_at
+
+
+def _invoices(company_id: int):
+    stmt = select(
+        Invoice.id.label("invoice_id"),
+        Invoice.invoice_number,
+        Invoice.title,
+        Invoice.status,
+        Invoice.created_at,
+        Invoice.due_date,
+        Invoice.subtotal,
+        Invoice.tax,
+        Invoice.total,
+        Invoice.balance_due,
+        Client.name.label("client_name")
+    ).join(Quote, Invoice.quote_id == Quote.id).join(Client, Quote.client_id == Client.id)
+    return stmt.where(Invoice.company_id == company_id).order_by(Invoice.created_at, Invoice.id), Invoice.created_at
+
+
+def _line_items(company_id: int):
+    stmt = select(
+        Quote.id.label("quote_id"),
+        Quote.title.label("quote_title"),
+        Quote.created_at.label("quote_created_at"),
+        LineItem.id.label("line_item_id"),
+        LineItem.description,
+        LineItem.quantity,
+        LineItem.rate,
+        LineItem.total
+    ).join(Quote, LineItem.quote_id == Quote.id)
+    return stmt.where(Quote.company_id == company_id).order_by(Quote.created_at, Quote.id, LineItem.id), Quote.created_at
+
+
+EXPORTS = {
+    "payments": _payments,
+    "invoices": _invoices,
+    "line_items": _line_items,
+}
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _encode_csv(columns, rows, include_header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if include_header:
+        writer.writerow(columns)
+    writer.writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _encode_ndjson(columns, rows, include_header: bool) -> bytes:
+    dumps = json.dumps
+    return "".join(dumps(dict(zip(columns, row)), default=_json_default) + "\n" for row in rows).encode()
+
+
+def stream_export(kind: str, export_format: str, company_id: int, start: date = None, end: date = None, compress: bool = False):
+    """Generator of encoded (and optionally gzipped) chunks; owns its own session for the stream's lifetime."""
+    stmt, date_column = EXPORTS[kind](company_id)
+    if start:
+        stmt = stmt.where(date_column >= datetime.combine(start, time.min))
+    if end:
+        stmt = stmt.where(date_column < datetime.combine(end + timedelta(days=1), time.min))
+
+    encode = _encode_csv if export_format == "csv" else _encode_ndjson
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31 -> gzip container
+
+    db = (ReadSessionLocal or SessionLocal)()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        columns = list(result.keys())
+        include_header = True
+        wrote_anything = False
+
+        for partition in result.partitions():
+            chunk = encode(columns, partition, include_header)
+            include_header = False
+            wrote_anything = True
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+
+        if not wrote_anything and export_format == "csv":
+            chunk = encode(columns, [], True)
+            yield compressor.compress(chunk) if compressor else chunk
+
+        if compressor:
+            yield compressor.flush()
+    finally:
+        db.close()
@@ -0,0 +1,40 @@
+"""
+Per-company invoice number allocation.
+
+Each company has one invoice_sequences row. Allocation locks that row with
+SELECT ... FOR UPDATE and bumps the counter inside the caller's transaction,
+so it is O(1) and only serializes invoice creation within one company. A
+rolled-back invoice also rolls back its increment, so numbers are gap-free.
+"""
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from config.environment import invoice_number_prefix, invoice_number_padding
+from models.invoice_sequence import InvoiceSequence
+
+
+def _ensure_sequence(db: Session, company_id: int):
+    dialect = db.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(InvoiceSequence).values(company_id=company_id, prefix=invoice_number_prefix, next_value=1)
+    db.execute(stmt.on_conflict_do_nothing(index_elements=["company_id"]))
+
+
+def _locked_sequence(db: Session, company_id: int) -> InvoiceSequence:
+    query = db.query(InvoiceSequence).filter(InvoiceSequence.company_id == company_id).with_for_update()
+    sequence = query.one_or_none()
+    if sequence is None:
+        # First invoice for this company; concurrent creators race on the insert, not the number
+        _ensure_sequence(db, company_id)
+        sequence = query.one()
+    return sequence
+
+
+def next_invoice_number(db: Session, company_id: int) -> str:
+    sequence = _locked_sequence(db, company_id)
+    value = sequence.next_value
+    sequence.next_value = value + 1
+    return f"{sequence.prefix}{value:0{invoice_number_padding}d}"
+
+
+def set_prefix(db: Session, company_id: int, prefix: str):
+    _locked_sequence(db, company_id).prefix = prefix
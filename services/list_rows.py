@@ -0,0 +1,139 @@
+"""
+Column-tuple rows for the quote and invoice list endpoints.
+
+The list pages select plain columns instead of ORM entities and build the
+QuoteResponse / InvoiceResponse shape as dicts directly (same keys, order and
+number formatting), so a page costs two flat queries and a dict per row
+rather than identity-map objects plus from_attributes validation of every
+nested line item and payment. The endpoints keep their response_model for
+the OpenAPI schema and return the dicts through FastJSONResponse.
+
+The statements are plain select()s, so the sync and async routers share them.
+"""
+from collections import defaultdict
+from sqlalchemy import select
+from models.client import Client
+from models.invoice import Invoice
+from models.line_item import LineItem
+from models.payment import Payment
+from models.quote import Quote
+
+QUOTE_COLUMNS = (
+    Quote.client_id, Quote.expiry_date, Quote.title, Quote.id, Quote.status, Quote.subtotal,
+    Quote.tax, Quote.tax_rate, Quote.total, Quote.created_at, Quote.updated_at
+)
+# Labelled so they don't collide with the quote's own id / client_id / created_at
+QUOTE_CLIENT_COLUMNS = tuple(
+    column.label(f"client__{column.key}") for column in (
+        Client.name, Client.email, Client.phone, Client.address, Client.id,
+        Client.user_id, Client.total_billed, Client.created_at, Client.updated_at
+    )
+)
+LINE_ITEM_COLUMNS = (LineItem.quote_id, LineItem.description, LineItem.quantity, LineItem.rate, LineItem.id, LineItem.total)
+
+INVOICE_COLUMNS = (
+    Invoice.quote_id, Invoice.due_date, Invoice.title, Invoice.status, Invoice.id, Invoice.invoice_number,
+    Invoice.subtotal, Invoice.tax, Invoice.total, Invoice.balance_due, Invoice.created_at, Invoice.updated_at
+)
+PAYMENT_COLUMNS = (
+    Payment.invoice_id, Payment.amount, Payment.method, Payment.reference, Payment.id,
+    Payment.paid_at, Payment.created_at, Payment.updated_at
+)
+
+
+def quote_list_statement(company_id: int):
+    return select(*QUOTE_COLUMNS, *QUOTE_CLIENT_COLUMNS).outerjoin(Client, Quote.client_id == Client.id).where(Quote.company_id == company_id)
+
+
+def line_items_statement(quote_ids):
+    return select(*LINE_ITEM_COLUMNS).where(LineItem.quote_id.in_(quote_ids)).order_by(LineItem.id)
+
+
+def invoice_list_statement(company_id: int):
+    return select(*INVOICE_COLUMNS).where(Invoice.company_id == company_id)
+
+
+def payments_statement(invoice_ids):
+    return select(*PAYMENT_COLUMNS).where(Payment.invoice_id.in_(invoice_ids)).order_by(Payment.id)
+
+
+def quote_rows(rows, line_items) -> list:
+    """rows from quote_list_statement, line_items from line_items_statement."""
+    items_by_quote = defaultdict(list)
+    for quote_id, description, quantity, rate, item_id, total in line_items:
+        items_by_quote[quote_id].append({
+            "description": description,
+            "quantity": quantity,
+            "rate": float(rate),
+            "id": item_id,
+            "quote_id": quote_id,
+            "total": float(total)
+        })
+
+    result = []
+    for (client_id, expiry_date, title, quote_id, status, subtotal, tax, tax_rate, total, created_at, updated_at,
+         client_name, client_email, client_phone, client_address, client_row_id, client_user_id,
+         client_total_billed, client_created_at, client_updated_at) in rows:
+        result.append({
+            "client_id": client_id,
+            "expiry_date": expiry_date,
+            "title": title,
+            "id": quote_id,
+            "status": status,
+            "subtotal": float(subtotal),
+            "tax": float(tax),
+            "tax_rate": float(tax_rate),
+            "total": float(total),
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "line_items": items_by_quote.get(quote_id, []),
+            "client": {
+                "name": client_name,
+                "email": client_email,
+                "phone": client_phone,
+                "address": client_address,
+                "id": client_row_id,
+                "user_id": client_user_id,
+                "total_billed": float(client_total_billed),
+                "created_at": client_created_at,
+                "updated_at": client_updated_at
+            } if client_row_id is not None else None
+        })
+    return result
+
+
+def invoice_rows(rows, payments) -> list:
+    """rows from invoice_list_statement, payments from payments_statement."""
+    payments_by_invoice = defaultdict(list)
+    for invoice_id, amount, method, reference, payment_id, paid_at, created_at, updated_at in payments:
+        payments_by_invoice[invoice_id].append({
+            "amount": float(amount),
+            "method": method,
+            "reference": reference,
+            "payment_date": None,
+            "id": payment_id,
+            "invoice_id": invoice_id,
+            "paid_at": paid_at,
+            "created_at": created_at,
+            "updated_at": updated_at
+        })
+
+    return [
+        {
+            "quote_id": quote_id,
+            "due_date": due_date,
+            "title": title,
+            "status": status,
+            "id": invoice_id,
+            "invoice_number": invoice_number,
+            "subtotal": float(subtotal),
+            "tax": float(tax),
+            "total": float(total),
+            "balance_due": float(balance_due),
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "payments": payments_by_invoice.get(invoice_id, [])
+        }
+        for (quote_id, due_date, title, status, invoice_id, invoice_number, subtotal, tax, total,
+             balance_due, created_at, updated_at) in rows
+    ]
@@ -0,0 +1,98 @@
+"""
+Running payment totals on invoices.
+
+Invoice.total_paid is adjusted by each payment write with a single
+`UPDATE ... SET total_paid = total_paid + :delta`, while the invoice row is
+held with SELECT ... FOR UPDATE, so concurrent payments on one invoice queue
+up instead of both passing the balance check. Nothing on the write path
+loads or sums the invoice's payments.
+
+Run `python -m services.payment_ledger` to compare every total_paid against
+the payments table (`--company-id N` to scope it, `--fix` to correct drift).
+"""
+import argparse
+from datetime import date
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from models.invoice import Invoice
+from models.payment import Payment
+from services import rollups
+
+
+def lock_invoice(db: Session, invoice_id: int, company_id: int):
+    return db.query(Invoice).filter(
+        Invoice.id == invoice_id,
+        Invoice.company_id == company_id
+    ).with_for_update().populate_existing().first()
+
+
+def refresh_invoice_state(invoice: Invoice):
+    """
+    Derives balance due and status from total_paid.
+    Ensures balance never exceeds total and updates status (paid/sent/overdue).
+    """
+    invoice.balance_due = max(invoice.total - invoice.total_paid, 0)
+
+    if invoice.balance_due == 0 and invoice.total > 0:
+        invoice.status = "paid"
+    else:
+        if invoice.status == "paid":
+            invoice.status = "sent"
+
+        if invoice.due_date and invoice.due_date < date.today():
+            invoice.status = "overdue"
+        elif invoice.status == "overdue" and invoice.due_date and invoice.due_date >= date.today():
+            invoice.status = "sent"
+
+
+def apply_delta(db: Session, invoice: Invoice, delta):
+    """Adjust total_paid by delta in SQL, then bring balance and status in line; caller holds the row lock."""
+    invoice.total_paid = db.execute(
+        update(Invoice)
+        .where(Invoice.id == invoice.id)
+        .values(total_paid=Invoice.total_paid + delta)
+        .returning(Invoice.total_paid)
+    ).scalar_one()
+    refresh_invoice_state(invoice)
+
+
+def _paid_by_invoice(company_id: int = None):
+    paid = func.coalesce(func.sum(Payment.amount), 0)
+    stmt = select(Invoice.id, Invoice.total_paid, paid.label("paid")).outerjoin(
+        Payment, Payment.invoice_id == Invoice.id
+    ).group_by(Invoice.id, Invoice.total_paid)
+    if company_id is not None:
+        stmt = stmt.where(Invoice.company_id == company_id)
+    return stmt.having(Invoice.total_paid != paid)
+
+
+def reconcile(db: Session, company_id: int = None, fix: bool = False):
+    """Returns (invoice_id, recorded, actual) for every invoice whose total_paid disagrees with its payments."""
+    mismatches = [(row.id, row.total_paid, row.paid) for row in db.execute(_paid_by_invoice(company_id))]
+    if fix:
+        for invoice_id, _recorded, actual in mismatches:
+            invoice = db.query(Invoice).filter(Invoice.id == invoice_id).with_for_update().one()
+            before = rollups.invoice_state(invoice)
+            invoice.total_paid = actual
+            refresh_invoice_state(invoice)
+            rollups.track_invoice(db, invoice.company_id, before, rollups.invoice_state(invoice))
+    return mismatches
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Check invoice total_paid against the payments table")
+    parser.add_argument("--company-id", type=int, default=None)
+    parser.add_argument("--fix", action="store_true", help="correct mismatched invoices")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        mismatches = reconcile(db, args.company_id, args.fix)
+        for invoice_id, recorded, actual in mismatches:
+            print(f"invoice {invoice_id}: total_paid {recorded}, payments sum {actual}")
+        db.commit()
+        print(f"{len(mismatches)} mismatched invoice(s){' fixed' if args.fix and mismatches else ''}")
+    finally:
+        db.close()
@@ -0,0 +1,376 @@
+"""
+Shared PDF rendering for quotes and invoices.
+
+Controllers turn ORM rows into a plain DocumentSnapshot and hand it to
+render_document. The parts that repeat on every page (letterhead, footer,
+table column headings) are drawn once per document as PDF form XObjects and
+referenced from each page, so later pages only draw their variable rows.
+Forms belong to one canvas, so nothing is shared between documents; repeat
+renders of an unchanged document are served by services.pdf_cache instead.
+"""
+import io
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional, Tuple
+from fastapi import Response
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+from sqlalchemy.orm import joinedload, selectinload
+from models.invoice import Invoice
+from models.quote import Quote
+from utils.money import format_rate
+
+PAGE_WIDTH, PAGE_HEIGHT = letter
+LEFT = 50
+RIGHT = PAGE_WIDTH - 50
+TOP = PAGE_HEIGHT - 50
+BOTTOM_MARGIN = 100
+ITEM_ROW_HEIGHT = 20
+PAYMENT_ROW_HEIGHT = 15
+ITEM_COLUMNS = (50, 300, 380, 480)
+PAYMENT_COLUMNS = (50, 150, 250, 450)
+
+# Bump whenever the layout changes so cached renders from older code are not served
+RENDERER_VERSION = 2
+
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^a-zA-Z0-9_\-]')
+
+
+@dataclass(frozen=True)
+class LineRow:
+    description: str
+    quantity: int
+    rate: Decimal
+    total: Decimal
+
+
+@dataclass(frozen=True)
+class PaymentRow:
+    paid_on: str
+    method: str
+    reference: str
+    amount: Decimal
+
+
+@dataclass(frozen=True)
+class DocumentSnapshot:
+    """Everything needed to render a document, with no ORM objects attached."""
+    kind: str
+    number: str
+    title: str
+    issued_on: str
+    date_line: Optional[str]
+    company_name: str
+    company_email: str
+    prepared_by: str
+    client_name: str
+    client_email: str
+    client_phone: Optional[str]
+    client_address: Optional[str]
+    line_items: Tuple[LineRow, ...]
+    subtotal: Decimal
+    tax: Decimal
+    tax_rate: Decimal
+    total: Decimal
+    balance_due: Optional[Decimal]
+    payments: Tuple[PaymentRow, ...]
+    filename: str
+
+
+def _safe_filename(title: str, suffix) -> str:
+    return f"{_UNSAFE_FILENAME_CHARS.sub('_', title)}_{suffix}.pdf"
+
+
+def _line_rows(line_items):
+    return tuple(LineRow(item.description, item.quantity, item.rate, item.total) for item in line_items)
+
+
+# Loader options covering everything the snapshot builders below read
+QUOTE_PDF_OPTIONS = (joinedload(Quote.client), selectinload(Quote.line_items))
+INVOICE_PDF_OPTIONS = (
+    joinedload(Invoice.quote).joinedload(Quote.client),
+    joinedload(Invoice.quote).selectinload(Quote.line_items),
+    selectinload(Invoice.payments),
+)
+
+
+def quote_snapshot(quote, user) -> DocumentSnapshot:
+    client = quote.client
+    return DocumentSnapshot(
+        kind="QUOTE",
+        number=f"#{quote.id}",
+        title=quote.title,
+        issued_on=quote.created_at.strftime('%Y-%m-%d'),
+        date_line=f"Expires: {quote.expiry_date.strftime('%Y-%m-%d')}" if quote.expiry_date else None,
+        company_name=user.company_name or "Company Name",
+        company_email=user.email,
+        prepared_by=user.username,
+        client_name=client.name,
+        client_email=client.email,
+        client_phone=client.phone,
+        client_address=client.address,
+        line_items=_line_rows(quote.line_items),
+        subtotal=quote.subtotal,
+        tax=quote.tax,
+        tax_rate=quote.tax_rate,
+        total=quote.total,
+        balance_due=None,
+        payments=(),
+        filename=_safe_filename(quote.title, quote.id)
+    )
+
+
+def invoice_snapshot(invoice, user) -> DocumentSnapshot:
+    quote = invoice.quote
+    client = quote.client
+    return DocumentSnapshot(
+        kind="INVOICE",
+        number=f"#{invoice.invoice_number}",
+        title=invoice.title,
+        issued_on=invoice.created_at.strftime('%Y-%m-%d'),
+        date_line=f"Due Date: {invoice.due_date}" if invoice.due_date else None,
+        company_name=user.company_name or "Company Name",
+        company_email=user.email,
+        prepared_by=user.username,
+        client_name=client.name,
+        client_email=client.email,
+        client_phone=client.phone,
+        client_address=client.address,
+        line_items=_line_rows(quote.line_items),
+        subtotal=invoice.subtotal,
+        tax=invoice.tax,
+        tax_rate=quote.tax_rate,
+        total=invoice.total,
+        balance_due=invoice.balance_due,
+        payments=tuple(
+            PaymentRow(payment.paid_at.strftime('%Y-%m-%d'), payment.method, payment.reference or "-", payment.amount)
+            for payment in invoice.payments
+        ),
+        filename=_safe_filename(invoice.title, invoice.invoice_number)
+    )
+
+
+@lru_cache(maxsize=8192)
+def _text_width(text: str, font: str, size: float) -> float:
+    return stringWidth(text, font, size)
+
+
+def _money(value) -> str:
+    return f"${value:,.2f}"
+
+
+class PageTemplate:
+    """Repeating layout of one document, defined as form XObjects on its canvas and replayed on every page."""
+
+    def __init__(self, company_name: str, company_email: str, prepared_by: str):
+        self.company_name = company_name
+        self.company_email = company_email
+        self.prepared_by = prepared_by
+        self.footer_note = "Thank you for your business!"
+        self.footer_note_x = PAGE_WIDTH / 2 - _text_width(self.footer_note, "Helvetica", 9) / 2
+
+    def define_forms(self, p):
+        p.beginForm("letterhead")
+        p.setFont("Helvetica-Bold", 16)
+        p.drawString(LEFT, TOP, self.company_name)
+        p.setFont("Helvetica", 10)
+        p.drawString(LEFT, TOP - 20, self.company_email)
+        p.endForm()
+
+        p.beginForm("footer")
+        p.setFont("Helvetica", 9)
+        p.setFillColorRGB(0.5, 0.5, 0.5)
+        p.drawString(LEFT, 50, f"Prepared by: {self.prepared_by}")
+        p.drawString(self.footer_note_x, 30, self.footer_note)
+        p.endForm()
+
+        # Table headings are drawn relative to y=0 (bounding boxes sized to match) and translated into place
+        p.beginForm("items_header", lowery=-30, uppery=10)
+        p.setLineWidth(1)
+        p.line(LEFT, 0, RIGHT, 0)
+        p.setFont("Helvetica-Bold", 10)
+        for x, heading in zip(ITEM_COLUMNS, ("DESCRIPTION", "QTY", "RATE", "AMOUNT")):
+            p.drawString(x, -15, heading)
+        p.line(LEFT, -20, RIGHT, -20)
+        p.endForm()
+
+        p.beginForm("payments_header", lowery=-30, uppery=20)
+        p.setFont("Helvetica-Bold", 12)
+        p.drawString(LEFT, 0, "Payment History")
+        p.setFont("Helvetica-Bold", 10)
+        for x, heading in zip(PAYMENT_COLUMNS, ("Date", "Method", "Reference", "Amount")):
+            p.drawString(x, -20, heading)
+        p.line(LEFT, -25, 500, -25)
+        p.endForm()
+
+
+def _place_form(p, name: str, y: float):
+    p.saveState()
+    p.translate(0, y)
+    p.doForm(name)
+    p.restoreState()
+
+
+def _draw_right(p, x: float, y: float, text: str, font: str, size: float):
+    p.drawString(x - _text_width(text, font, size), y, text)
+
+
+class _Renderer:
+    def __init__(self, doc: DocumentSnapshot, p):
+        self.doc = doc
+        self.p = p
+
+    def new_page(self) -> float:
+        self.p.doForm("footer")
+        self.p.showPage()
+        return TOP
+
+    def first_page(self) -> float:
+        p, doc = self.p, self.doc
+        p.doForm("letterhead")
+
+        # Document info (right)
+        p.setFont("Helvetica-Bold", 24)
+        _draw_right(p, RIGHT, TOP, doc.kind, "Helvetica-Bold", 24)
+        p.setFont("Helvetica-Bold", 12)
+        _draw_right(p, RIGHT, TOP - 30, doc.number, "Helvetica-Bold", 12)
+        p.setFont("Helvetica", 10)
+        _draw_right(p, RIGHT, TOP - 45, f"Date: {doc.issued_on}", "Helvetica", 10)
+        if doc.date_line:
+            _draw_right(p, RIGHT, TOP - 60, doc.date_line, "Helvetica", 10)
+
+        # Bill to
+        y = PAGE_HEIGHT - 140
+        p.setFont("Helvetica-Bold", 10)
+        p.drawString(LEFT, y, "BILL TO:")
+        y -= 15
+        p.setFont("Helvetica", 12)
+        p.drawString(LEFT, y, doc.client_name)
+        y -= 15
+        p.setFont("Helvetica", 10)
+        p.drawString(LEFT, y, doc.client_email)
+        if doc.client_phone:
+            y -= 12
+            p.drawString(LEFT, y, doc.client_phone)
+        if doc.client_address:
+            y -= 12
+            p.drawString(LEFT, y, doc.client_address)
+
+        # Title
+        y -= 40
+        p.setFont("Helvetica-Bold", 14)
+        p.drawString(LEFT, y, doc.title)
+        return y - 30
+
+    def line_items(self, y: float) -> float:
+        p = self.p
+        draw = p.drawString
+        desc_x, qty_x, rate_x, amount_x = ITEM_COLUMNS
+
+        _place_form(p, "items_header", y)
+        y -= 40
+        p.setFont("Helvetica", 10)
+
+        for item in self.doc.line_items:
+            if y < BOTTOM_MARGIN:
+                y = self.new_page()
+                _place_form(p, "items_header", y)
+                y -= 40
+                p.setFont("Helvetica", 10)
+
+            draw(desc_x, y, item.description)
+            draw(qty_x, y, str(item.quantity))
+            draw(rate_x, y, f"${item.rate:,.2f}")
+            draw(amount_x, y, f"${item.total:,.2f}")
+            y -= ITEM_ROW_HEIGHT
+        return y
+
+    def totals(self, y: float) -> float:
+        p, doc = self.p, self.doc
+        needed = 60 if doc.balance_due is None else 80
+        if y - needed < BOTTOM_MARGIN - ITEM_ROW_HEIGHT:
+            y = self.new_page()
+
+        y -= 10
+        p.line(300, y, RIGHT, y)
+        y -= 20
+
+        p.setFont("Helvetica-Bold", 10)
+        p.drawString(380, y, "Subtotal:")
+        _draw_right(p, RIGHT, y, _money(doc.subtotal), "Helvetica-Bold", 10)
+        y -= 15
+        p.drawString(380, y, f"Tax ({format_rate(doc.tax_rate)}):")
+        _draw_right(p, RIGHT, y, _money(doc.tax), "Helvetica-Bold", 10)
+        y -= 15
+
+        if doc.balance_due is None:
+            p.setFillColorRGB(0.9, 0.9, 0.9) # Light gray background for total
+            p.rect(370, y - 5, RIGHT - 370, 20, fill=1, stroke=0)
+            p.setFillColorRGB(0, 0, 0)
+
+        p.setFont("Helvetica-Bold", 12)
+        p.drawString(380, y, "Total:")
+        _draw_right(p, RIGHT, y, _money(doc.total), "Helvetica-Bold", 12)
+
+        if doc.balance_due is not None:
+            y -= 20
+            if doc.balance_due > 0:
+                p.setFillColorRGB(0.8, 0, 0)
+            else:
+                p.setFillColorRGB(0, 0.6, 0)
+            p.drawString(380, y, "Balance Due:")
+            _draw_right(p, RIGHT, y, _money(doc.balance_due), "Helvetica-Bold", 12)
+            p.setFillColorRGB(0, 0, 0)
+        return y
+
+    def payments(self, y: float) -> float:
+        p = self.p
+        draw = p.drawString
+        date_x, method_x, reference_x, amount_x = PAYMENT_COLUMNS
+
+        y -= 40
+        if y < BOTTOM_MARGIN:
+            y = self.new_page()
+        _place_form(p, "payments_header", y)
+        y -= 40
+        p.setFont("Helvetica", 10)
+
+        for payment in self.doc.payments:
+            if y < BOTTOM_MARGIN:
+                y = self.new_page()
+                _place_form(p, "payments_header", y)
+                y -= 40
+                p.setFont("Helvetica", 10)
+
+            draw(date_x, y, payment.paid_on)
+            draw(method_x, y, payment.method)
+            draw(reference_x, y, payment.reference)
+            draw(amount_x, y, f"${payment.amount:,.2f}")
+            y -= PAYMENT_ROW_HEIGHT
+        return y
+
+
+def render_document(doc: DocumentSnapshot) -> bytes:
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=letter)
+    PageTemplate(doc.company_name, doc.company_email, doc.prepared_by).define_forms(p)
+
+    renderer = _Renderer(doc, p)
+    y = renderer.first_page()
+    y = renderer.line_items(y)
+    y = renderer.totals(y)
+    if doc.payments:
+        renderer.payments(y)
+
+    p.doForm("footer")
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
+
+
+def pdf_response(content: bytes, filename: str, headers: dict = None) -> Response:
+    headers = {**(headers or {}), "Content-Disposition": f'attachment; filename="{filename}"'}
+    return Response(content=content, media_type="application/pdf", headers=headers)
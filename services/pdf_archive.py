@@ -0,0 +1,99 @@
+"""
+Bulk PDF download as a streamed ZIP archive.
+
+Documents are loaded in batches, rendered in parallel through the PDF cache
+and render pool, and appended to the archive as they finish. zipfile writes
+to an unseekable sink using data descriptors, so each member is yielded to the
+client as soon as it is written and the full archive is never held in memory.
+"""
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+from config.environment import pdf_render_workers
+from database import SessionLocal, ReadSessionLocal
+from models.invoice import Invoice
+from models.quote import Quote
+from serializers.pdf_archive import PDFArchiveRequest
+from services import pdf
+from services.pdf_cache import pdf_cache
+
+ARCHIVE_BATCH_SIZE = 50
+
+ARCHIVES = {
+    "invoices": (Invoice, pdf.INVOICE_PDF_OPTIONS, pdf.invoice_snapshot),
+    "quotes": (Quote, pdf.QUOTE_PDF_OPTIONS, pdf.quote_snapshot),
+}
+
+
+def matching_ids(db, kind: str, company_id: int, request: PDFArchiveRequest):
+    model = ARCHIVES[kind][0]
+    query = db.query(model.id).filter(model.company_id == company_id)
+    if request.ids is not None:
+        query = query.filter(model.id.in_(request.ids))
+    if request.start:
+        query = query.filter(model.created_at >= datetime.combine(request.start, time.min))
+    if request.end:
+        query = query.filter(model.created_at < datetime.combine(request.end + timedelta(days=1), time.min))
+    if request.status:
+        query = query.filter(model.status == request.status)
+    return [row.id for row in query.order_by(model.created_at, model.id)]
+
+
+class _ZipSink:
+    """Minimal write-only file object; zipfile only needs write(), tell() and flush()."""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _unique_name(filename: str, seen: set) -> str:
+    name, suffix = filename, 1
+    while name in seen:
+        suffix += 1
+        name = filename.replace(".pdf", f"_{suffix}.pdf")
+    seen.add(name)
+    return name
+
+
+def stream_archive(kind: str, ids, user):
+    """Generator of ZIP bytes; owns its own session for the stream's lifetime."""
+    model, options, snapshot = ARCHIVES[kind]
+    render = lambda doc: pdf_cache.get_or_render(doc, wait=True)
+    sink = _ZipSink()
+    seen = set()
+
+    db = (ReadSessionLocal or SessionLocal)()
+    try:
+        with ThreadPoolExecutor(max_workers=max(pdf_render_workers, 1)) as renderers, \
+                zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for offset in range(0, len(ids), ARCHIVE_BATCH_SIZE):
+                batch = ids[offset:offset + ARCHIVE_BATCH_SIZE]
+                records = db.query(model).options(*options).filter(model.id.in_(batch)).all()
+                order = {record_id: position for position, record_id in enumerate(batch)}
+                docs = [snapshot(record, user) for record in sorted(records, key=lambda record: order[record.id])]
+                db.expunge_all()
+
+                # map() yields in submission order while later documents keep rendering
+                for doc, content in zip(docs, renderers.map(render, docs)):
+                    archive.writestr(_unique_name(doc.filename, seen), content)
+                    yield sink.drain()
+        yield sink.drain()
+    finally:
+        db.close()
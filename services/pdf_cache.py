@@ -0,0 +1,123 @@
+"""
+Content-addressed cache for rendered PDFs.
+
+The cache key is a hash of the DocumentSnapshot, which already holds every
+value that ends up on the page (record fields, line items, the payment set,
+company/user header fields), plus the renderer version. Any change to those
+inputs produces a new key, so entries never need explicit invalidation; old
+ones are evicted least-recently-used once the directory exceeds its size cap.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from fastapi import Response
+from starlette.concurrency import run_in_threadpool
+from config.environment import pdf_cache_dir, pdf_cache_max_bytes
+from services import pdf, pdf_pool
+from services.analytics_cache import etag_matches
+
+
+def document_key(doc: pdf.DocumentSnapshot) -> str:
+    # Snapshot fields are str/int/Decimal/tuples, so repr() is stable across processes
+    return hashlib.sha256(f"v{pdf.RENDERER_VERSION}:{doc!r}".encode()).hexdigest()
+
+
+class DiskPDFCache:
+    """Size-bounded LRU over files in a directory; a file's mtime is its last use."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pdf")
+
+    def _entries(self):
+        for root, _dirs, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return content
+
+    def set(self, key: str, content: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _mtime, size, _path in self._entries())
+            else:
+                self._size += len(content)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Other workers share the directory, so re-scan rather than trust the running total
+        entries = sorted(self._entries())
+        total = sum(size for _mtime, size, _path in entries)
+        target = self.max_bytes * 0.9
+        for _mtime, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+    def get_or_render(self, doc: pdf.DocumentSnapshot, key: str = None, wait: bool = False) -> bytes:
+        if not self.enabled:
+            return pdf_pool.render(doc, wait)
+        key = key or document_key(doc)
+        content = self.get(key)
+        if content is None:
+            content = pdf_pool.render(doc, wait)
+            self.set(key, content)
+        return content
+
+    async def get_or_render_async(self, doc: pdf.DocumentSnapshot, key: str = None) -> bytes:
+        if not self.enabled:
+            return await pdf_pool.render_async(doc)
+        key = key or document_key(doc)
+        content = await run_in_threadpool(self.get, key)
+        if content is None:
+            content = await pdf_pool.render_async(doc)
+            await run_in_threadpool(self.set, key, content)
+        return content
+
+
+pdf_cache = DiskPDFCache(pdf_cache_dir, pdf_cache_max_bytes)
+
+
+async def cached_pdf_response(doc: pdf.DocumentSnapshot, if_none_match: str = None) -> Response:
+    key = document_key(doc)
+    headers = {"ETag": f'"{key}"', "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return pdf.pdf_response(await pdf_cache.get_or_render_async(doc, key), doc.filename, headers)
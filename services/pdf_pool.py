@@ -0,0 +1,30 @@
+"""
+Worker processes for PDF rendering.
+
+reportlab is pure-Python CPU work; rendering on the request threadpool holds
+the GIL and slows every other request in the worker. Documents are rendered
+in a separate process pool instead, from a picklable DocumentSnapshot.
+
+The PDF endpoints await render_async(), so a request waiting on a render holds
+no threadpool slot. render() blocks its caller and is for the archive
+builder's background threads.
+"""
+from config.environment import pdf_render_workers, pdf_render_max_pending, pdf_render_timeout
+from services import pdf
+from utils.process_pool import BoundedProcessPool
+
+render_pool = BoundedProcessPool(
+    workers=pdf_render_workers,
+    max_pending=pdf_render_max_pending,
+    timeout=pdf_render_timeout,
+    busy_detail="Too many documents are being generated, please retry shortly",
+    timeout_detail="Document generation timed out, please retry"
+)
+
+
+def render(doc: pdf.DocumentSnapshot, wait: bool = False) -> bytes:
+    return render_pool.run(pdf.render_document, doc, wait=wait)
+
+
+async def render_async(doc: pdf.DocumentSnapshot) -> bytes:
+    return await render_pool.run_async(pdf.render_document, doc)
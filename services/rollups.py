@@ -0,0 +1,123 @@
+"""
+Incremental maintenance of the analytics rollup tables.
+
+Write paths call record_payment / track_invoice / remove_invoice inside their
+own transaction, so rollups commit or roll back together with the change.
+Run `python -m services.rollups` to rebuild them from scratch (all companies,
+or `--company-id N`), e.g. after a backfill or a manual data fix.
+"""
+import argparse
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import func, case, Date
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from models.analytics_rollup import RevenueDaily, RevenueByClient, InvoiceDueRollup
+from models.invoice import Invoice
+from models.payment import Payment
+from models.quote import Quote
+from utils.money import to_money
+
+InvoiceState = namedtuple("InvoiceState", ["due_date", "balance_due"])
+
+
+def invoice_state(invoice: Invoice):
+    """Snapshot the fields the due-date rollup depends on; take it before mutating the invoice."""
+    return InvoiceState(invoice.due_date, to_money(invoice.balance_due or 0))
+
+
+def _upsert(db: Session, model, keys: dict, increments: dict):
+    dialect = db.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    now = datetime.now()
+
+    stmt = insert(model).values(**keys, **increments, created_at=now, updated_at=now)
+    updates = {column: getattr(model, column) + stmt.excluded[column] for column in increments}
+    updates["updated_at"] = now
+    db.execute(stmt.on_conflict_do_update(index_elements=list(keys), set_=updates))
+
+
+def record_payment(db: Session, company_id: int, client_id: int, paid_at, amount, sign: int = 1):
+    """Add (sign=1) or remove (sign=-1) a payment's amount from the revenue rollups."""
+    amount = to_money(amount) * sign
+    day = paid_at.date() if isinstance(paid_at, datetime) else paid_at
+    _upsert(db, RevenueDaily, {"company_id": company_id, "day": day}, {"total": amount})
+    _upsert(db, RevenueByClient, {"company_id": company_id, "client_id": client_id}, {"total": amount})
+
+
+def track_invoice(db: Session, company_id: int, before, after):
+    """Move an invoice between due-date buckets; before is None for new invoices, after for deleted ones."""
+    if before == after:
+        return
+    if before is not None:
+        _upsert(db, InvoiceDueRollup, {"company_id": company_id, "due_date": before.due_date}, {
+            "outstanding": -before.balance_due,
+            "open_count": -1 if before.balance_due > 0 else 0
+        })
+    if after is not None:
+        _upsert(db, InvoiceDueRollup, {"company_id": company_id, "due_date": after.due_date}, {
+            "outstanding": after.balance_due,
+            "open_count": 1 if after.balance_due > 0 else 0
+        })
+
+
+def remove_invoice(db: Session, invoice: Invoice):
+    """Undo everything an invoice and its payments contributed, before the invoice is deleted."""
+    client_id = invoice.quote.client_id
+    for payment in invoice.payments:
+        record_payment(db, invoice.company_id, client_id, payment.paid_at, payment.amount, sign=-1)
+    track_invoice(db, invoice.company_id, invoice_state(invoice), None)
+
+
+def rebuild(db: Session, company_id: int = None):
+    """Recompute every rollup row from the source tables."""
+    for model in (RevenueDaily, RevenueByClient, InvoiceDueRollup):
+        query = db.query(model)
+        if company_id is not None:
+            query = query.filter(model.company_id == company_id)
+        query.delete(synchronize_session=False)
+
+    def scoped(query, model):
+        return query.filter(model.company_id == company_id) if company_id is not None else query
+
+    day = func.date(Payment.paid_at, type_=Date)
+    daily = scoped(db.query(Payment.company_id, day, func.sum(Payment.amount)), Payment).group_by(Payment.company_id, day)
+    db.bulk_insert_mappings(RevenueDaily, [
+        {"company_id": row[0], "day": row[1], "total": row[2]} for row in daily
+    ])
+
+    by_client = scoped(
+        db.query(Payment.company_id, Quote.client_id, func.sum(Payment.amount))
+        .join(Invoice, Payment.invoice_id == Invoice.id)
+        .join(Quote, Invoice.quote_id == Quote.id),
+        Payment
+    ).group_by(Payment.company_id, Quote.client_id)
+    db.bulk_insert_mappings(RevenueByClient, [
+        {"company_id": row[0], "client_id": row[1], "total": row[2]} for row in by_client
+    ])
+
+    buckets = scoped(db.query(
+        Invoice.company_id,
+        Invoice.due_date,
+        func.sum(Invoice.balance_due),
+        func.sum(case((Invoice.balance_due > 0, 1), else_=0))
+    ), Invoice).group_by(Invoice.company_id, Invoice.due_date)
+    db.bulk_insert_mappings(InvoiceDueRollup, [
+        {"company_id": row[0], "due_date": row[1], "outstanding": row[2], "open_count": row[3]} for row in buckets
+    ])
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rebuild analytics rollup tables")
+    parser.add_argument("--company-id", type=int, default=None)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rebuild(db, args.company_id)
+        db.commit()
+        print("Analytics rollups rebuilt.")
+    finally:
+        db.close()
@@ -0,0 +1,119 @@
+"""
+Date-driven status transitions.
+
+- Invoices that are `sent`, past due and still owe money become `overdue`.
+- Quotes that are `draft` or `sent` and past their expiry date become `expired`.
+
+Each transition is a set-based UPDATE over at most batch_size rows of one
+company at a time, committed per batch so row locks stay short. Every run is
+recorded in job_runs with its row, company and batch counts and duration.
+
+Run from cron with `python -m services.status_jobs`, or set
+STATUS_JOBS_INTERVAL to run it inside the API process. The updates are
+idempotent, so overlapping runs from several workers are harmless.
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import date, datetime
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from config.environment import status_jobs_batch_size
+from database import SessionLocal
+from models.invoice import Invoice
+from models.job_run import JobRun
+from models.quote import Quote
+
+logger = logging.getLogger(__name__)
+
+
+def _overdue_invoices(today: date):
+    return Invoice, (Invoice.status == "sent", Invoice.due_date < today, Invoice.balance_due > 0), "overdue"
+
+
+def _expired_quotes(today: date):
+    return Quote, (Quote.status.in_(("draft", "sent")), Quote.expiry_date < today), "expired"
+
+
+JOBS = {
+    "mark_overdue_invoices": _overdue_invoices,
+    "expire_quotes": _expired_quotes,
+}
+
+
+def _transition(db: Session, stats: dict, model, conditions, new_status: str, company_id: int = None, batch_size: int = status_jobs_batch_size):
+    companies = select(model.company_id).where(*conditions).distinct()
+    if company_id is not None:
+        companies = companies.where(model.company_id == company_id)
+
+    for cid in db.scalars(companies).all():
+        stats["companies"] += 1
+        while True:
+            batch = select(model.id).where(model.company_id == cid, *conditions).limit(batch_size).scalar_subquery()
+            result = db.execute(
+                update(model).where(model.id.in_(batch)).values(status=new_status, updated_at=datetime.now()),
+                execution_options={"synchronize_session": False}
+            )
+            db.commit()
+            stats["batches"] += 1
+            stats["rows_updated"] += result.rowcount
+            if result.rowcount < batch_size:
+                break
+
+
+def run_job(name: str, today: date = None, company_id: int = None, batch_size: int = status_jobs_batch_size) -> JobRun:
+    model, conditions, new_status = JOBS[name](today or date.today())
+    db = SessionLocal()
+    run = JobRun(job=name, started_at=datetime.now(), status="running")
+    db.add(run)
+    db.commit()
+    started = time.perf_counter()
+    stats = {"rows_updated": 0, "companies": 0, "batches": 0}
+    status = "failed"
+    try:
+        _transition(db, stats, model, conditions, new_status, company_id, batch_size)
+        status = "succeeded"
+    except Exception as exc:
+        db.rollback()
+        run.error = repr(exc)
+        raise
+    finally:
+        for key, value in stats.items():
+            setattr(run, key, value)
+        run.status = status
+        run.finished_at = datetime.now()
+        run.duration_ms = int((time.perf_counter() - started) * 1000)
+        db.commit()
+        db.refresh(run)
+        db.expunge(run)
+        db.close()
+    return run
+
+
+def run_all(today: date = None, company_id: int = None, batch_size: int = status_jobs_batch_size):
+    return [run_job(name, today, company_id, batch_size) for name in JOBS]
+
+
+async def run_periodically(interval: int):
+    """In-process scheduler; started from main.py when STATUS_JOBS_INTERVAL is set."""
+    while True:
+        try:
+            for run in await asyncio.to_thread(run_all):
+                logger.info("%s updated %s rows in %s ms", run.job, run.rows_updated, run.duration_ms)
+        except Exception:
+            logger.exception("Status jobs failed")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mark overdue invoices and expire quotes")
+    parser.add_argument("--job", choices=sorted(JOBS), default=None, help="run one job instead of all")
+    parser.add_argument("--company-id", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=status_jobs_batch_size)
+    args = parser.parse_args()
+
+    names = [args.job] if args.job else list(JOBS)
+    for name in names:
+        run = run_job(name, company_id=args.company_id, batch_size=args.batch_size)
+        print(f"{run.job}: {run.rows_updated} rows, {run.companies} companies, {run.batches} batches, {run.duration_ms} ms")
@@ -0,0 +1,71 @@
+"""
+Shared fixtures: the app on a throwaway SQLite database seeded by benchmarks.dataset.
+
+Settings are read at import time, so the environment is prepared before
+anything from the app is imported.
+"""
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="inflow-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_tmp, 'test.db')}",
+    "JWT_SECRET": "test-secret-with-enough-bytes-for-hs256",
+    "PASSWORD_BCRYPT_ROUNDS": "4",
+    "PASSWORD_HASH_WORKERS": "0",
+    "PDF_RENDER_WORKERS": "0",
+    "PDF_CACHE_DIR": os.path.join(_tmp, "pdf_cache"),
+    "METRICS_ENABLED": "true",
+    "SERVER_TIMING_ENABLED": "true",
+})
+for _name in ("DATABASE_REPLICA_URL", "ASYNC_DATABASE_URL", "ASYNC_ROUTERS", "AUTH_TRUST_TOKEN_CLAIMS", "CACHE_BACKEND"):
+    os.environ.pop(_name, None)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+@pytest.fixture(scope="session")
+def client():
+    from main import app
+    from benchmarks import dataset
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        dataset.generate(db, dataset.DatasetSpec(companies=2, clients=4, quotes=3, line_items=3, payments=2))
+    finally:
+        db.close()
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    from benchmarks.dataset import BENCH_PASSWORD
+
+    response = client.post("/api/sign-in", json={"username": "bench_1", "password": BENCH_PASSWORD})
+    assert response.status_code == 200
+    headers = {"Authorization": f"Bearer {response.json()['token']}"}
+    # Warm the tenant cache so counts below are the steady state, not the first request's
+    assert client.get("/api/clients/", headers=headers).status_code == 200
+    return headers
+
+
+@pytest.fixture(scope="session")
+def seeded_ids(client):
+    """A quote and an invoice of bench_1's company."""
+    from database import SessionLocal
+    from models.invoice import Invoice
+    from models.user import UserModel
+
+    db = SessionLocal()
+    try:
+        company_id = db.scalar(select(UserModel.company_id).where(UserModel.username == "bench_1"))
+        quote_id, invoice_id = db.execute(
+            select(Invoice.quote_id, Invoice.id).where(Invoice.company_id == company_id).order_by(Invoice.id).limit(1)
+        ).one()
+    finally:
+        db.close()
+    return {"quote_id": quote_id, "invoice_id": invoice_id}
@@ -0,0 +1,24 @@
+import re
+
+ROWS_WRITTEN = re.compile(r'(\d+) rows affected"')
+
+
+def rows_affected(response) -> int:
+    return int(ROWS_WRITTEN.search(response.headers["Server-Timing"]).group(1))
+
+
+def test_reads_write_no_rows(client, auth_headers):
+    assert rows_affected(client.get("/api/quotes/", headers=auth_headers)) == 0
+
+
+def test_updates_report_rows_affected(client, auth_headers):
+    created = client.post("/api/clients/", json={"name": "Metrics Client", "email": "metrics@example.com"}, headers=auth_headers)
+    assert created.status_code == 201, created.text
+
+    response = client.put(f"/api/clients/{created.json()['id']}", json={"name": "Renamed Client"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert rows_affected(response) == 1
+
+
+def test_metrics_name_rows_affected(client):
+    assert "http_request_sql_rows_affected_total" in client.get("/metrics").text
@@ -0,0 +1,11 @@
+def test_payments_move_balance_due(client, auth_headers):
+    invoices = client.get("/api/invoices/?limit=50", headers=auth_headers).json()["items"]
+    invoice = next(invoice for invoice in invoices if invoice["balance_due"] >= 1)
+    path = f"/api/invoices/{invoice['id']}"
+
+    payment = client.post(f"{path}/payments", json={"amount": 1, "method": "cash"}, headers=auth_headers)
+    assert payment.status_code == 201
+    assert client.get(path, headers=auth_headers).json()["balance_due"] == round(invoice["balance_due"] - 1, 2)
+
+    assert client.delete(f"/api/payments/{payment.json()['id']}", headers=auth_headers).status_code == 204
+    assert client.get(path, headers=auth_headers).json()["balance_due"] == invoice["balance_due"]
@@ -0,0 +1,46 @@
+"""
+Pins the number of SQL statements the read endpoints run.
+
+A count going up usually means a lazy load or an N+1 crept in; if a change
+really needs another query, update the number here in the same commit.
+"""
+import re
+import pytest
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries')
+
+
+def query_count(response) -> int:
+    """Statements the request ran, as counted by its RequestStats and reported in Server-Timing."""
+    return int(SERVER_TIMING_QUERIES.search(response.headers["Server-Timing"]).group(1))
+
+
+def _get(client, auth_headers, path):
+    response = client.get(path, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    return response
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/api/quotes/", 2),
+    ("/api/invoices/", 2),
+])
+def test_list_query_counts(client, auth_headers, path, expected):
+    assert query_count(_get(client, auth_headers, path)) == expected
+
+
+@pytest.mark.parametrize("path", ["/api/quotes/", "/api/invoices/"])
+def test_list_query_count_does_not_grow_with_page_size(client, auth_headers, path):
+    small = query_count(_get(client, auth_headers, f"{path}?limit=1"))
+    large = query_count(_get(client, auth_headers, f"{path}?limit=50"))
+    assert small == large
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/api/quotes/{quote_id}", 3),
+    ("/api/invoices/{invoice_id}", 2),
+    ("/api/quotes/{quote_id}/pdf", 2),
+    ("/api/invoices/{invoice_id}/pdf", 3),
+])
+def test_detail_query_counts(client, auth_headers, seeded_ids, path, expected):
+    assert query_count(_get(client, auth_headers, path.format(**seeded_ids))) == expected
@@ -0,0 +1,12 @@
+def test_update_rejects_duplicate_line_item_ids(client, auth_headers, seeded_ids):
+    path = f"/api/quotes/{seeded_ids['quote_id']}"
+    before = client.get(path, headers=auth_headers).json()
+    item = before["line_items"][0]
+    duplicated = [{key: item[key] for key in ("id", "description", "quantity", "rate")}] * 2
+
+    response = client.put(path, json={"line_items": duplicated}, headers=auth_headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Line item {item['id']} is listed more than once"
+    after = client.get(path, headers=auth_headers).json()
+    assert (after["total"], after["line_items"]) == (before["total"], before["line_items"])
@@ -0,0 +1,19 @@
+from benchmarks.dataset import BENCH_PASSWORD
+
+
+def test_sign_up_joins_an_existing_company(client):
+    response = client.post("/api/sign-up", json={
+        "username": "bench_1_colleague", "email": "colleague@example.com", "password": BENCH_PASSWORD,
+        "role": "member", "company_name": "Bench Company 1"
+    })
+    assert response.status_code == 200, response.text
+    assert response.json()["company_name"] == "Bench Company 1"
+
+
+def test_profile_update_rejects_company_change(client, auth_headers):
+    response = client.put("/api/me", json={"company_name": "Bench Company 2"}, headers=auth_headers)
+    assert response.status_code == 400
+
+    same = client.put("/api/me", json={"company_name": "Bench Company 1"}, headers=auth_headers)
+    assert same.status_code == 200
+    assert same.json()["company_name"] == "Bench Company 1"
@@ -0,0 +1,143 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from config.environment import cache_backend, cache_redis_URL, cache_ttl, cache_max_entries, web_concurrency
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after ttl seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class MemoryCacheBackend:
+    """Per-process backend; counters never expire so versions only move forward."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._values = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._values.get(key)
+
+    def set(self, key, value, ttl: float = None):
+        self._values.set(key, value, ttl)
+
+    def get_counter(self, key, initial: int = 0) -> int:
+        """Current value, starting the counter at initial if it does not exist yet."""
+        with self._lock:
+            return self._counters.setdefault(key, initial)
+
+    def incr(self, key, initial: int = 0) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, initial) + 1
+            return self._counters[key]
+
+
+class RedisCacheBackend:
+    """Shared backend for multi-worker deployments. Values must be JSON serializable."""
+
+    def __init__(self, url: str, ttl: float):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package (pipenv install)")
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get(self, key):
+        raw = self._client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl: float = None):
+        self._client.set(key, json.dumps(value), ex=int(self.ttl if ttl is None else ttl))
+
+    def get_counter(self, key, initial: int = 0) -> int:
+        """Current value, starting the counter at initial if it does not exist yet."""
+        pipeline = self._client.pipeline()
+        pipeline.set(key, initial, nx=True)
+        pipeline.get(key)
+        return int(pipeline.execute()[1])
+
+    def incr(self, key, initial: int = 0) -> int:
+        pipeline = self._client.pipeline()
+        pipeline.set(key, initial, nx=True)
+        pipeline.incr(key)
+        return pipeline.execute()[1]
+
+
+class NullCacheBackend:
+    """Caches nothing: every get misses. Counters only echo their starting value."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl: float = None):
+        pass
+
+    def get_counter(self, key, initial: int = 0) -> int:
+        return initial
+
+    def incr(self, key, initial: int = 0) -> int:
+        return initial + 1
+
+
+def create_cache_backend():
+    if cache_backend == "redis":
+        return RedisCacheBackend(cache_redis_URL, cache_ttl)
+    if web_concurrency > 1:
+        # Invalidations would only reach the worker that handled the write; the others would keep serving stale entries
+        logger.warning(
+            "CACHE_BACKEND=memory is per process and %d workers are configured; response caching is off. "
+            "Set CACHE_BACKEND=redis to share the cache between workers.", web_concurrency
+        )
+        return NullCacheBackend()
+    return MemoryCacheBackend(cache_max_entries, cache_ttl)
+
+
+cache = create_cache_backend()
@@ -0,0 +1,192 @@
+"""
+Per-request performance instrumentation.
+
+InstrumentationMiddleware puts a RequestStats into a context variable for
+the duration of each HTTP request. Engine cursor events (attached to every
+engine by instrument_engine) add each statement's count and time to it, and
+for INSERT, UPDATE and DELETE the rows the driver reports as affected (its
+DB-API rowcount; rows read by SELECTs are not counted). The context is
+copied into the threadpool that runs sync endpoints and dependencies, so
+they report into the same object.
+
+The totals go out in a Server-Timing header and are aggregated per route
+into a MetricsRegistry, rendered in Prometheus text format by /metrics.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    sql_seconds: float = 0.0
+    rows_affected: int = 0
+    # The request's ASGI scope; routing adds the matched route and endpoint to it
+    scope: Optional[dict] = field(default=None, repr=False)
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'app;dur={total_seconds * 1000:.1f}, '
+            f'db;dur={self.sql_seconds * 1000:.1f};desc="{self.queries} queries, {self.rows_affected} rows affected"'
+        )
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info["query_started_at"].pop()
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    stats.queries += 1
+    stats.sql_seconds += time.perf_counter() - started_at
+    # Only writes: SELECT rowcount is driver specific (-1 on SQLite and for unbuffered cursors). Drivers that
+    # report -1 for a write (SQLite for INSERT ... RETURNING, before the rows are fetched) add nothing
+    if context is not None and (context.isinsert or context.isupdate or context.isdelete):
+        stats.rows_affected += max(cursor.rowcount, 0)
+
+
+def instrument_engine(engine):
+    """Attach statement timing to an Engine (or an AsyncEngine's sync_engine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class _RouteMetrics:
+    __slots__ = ("requests", "duration_sum", "buckets", "queries", "sql_seconds", "rows_affected", "response_bytes")
+
+    def __init__(self):
+        self.requests = {}
+        self.duration_sum = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.rows_affected = 0
+        self.response_bytes = 0
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """In-process aggregates keyed by (method, route template)."""
+
+    def __init__(self):
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float, stats: RequestStats, response_bytes: int):
+        with self._lock:
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[(method, route)] = _RouteMetrics()
+            metrics.requests[status_code] = metrics.requests.get(status_code, 0) + 1
+            metrics.duration_sum += seconds
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    metrics.buckets[index] += 1
+            metrics.queries += stats.queries
+            metrics.sql_seconds += stats.sql_seconds
+            metrics.rows_affected += stats.rows_affected
+            metrics.response_bytes += response_bytes
+
+    def render(self) -> str:
+        lines = [
+            "# TYPE http_requests_total counter",
+            "# TYPE http_request_duration_seconds histogram",
+            "# TYPE http_request_sql_queries_total counter",
+            "# TYPE http_request_sql_seconds_total counter",
+            "# TYPE http_request_sql_rows_affected_total counter",
+            "# TYPE http_response_bytes_total counter",
+        ]
+        with self._lock:
+            for (method, route), metrics in sorted(self._routes.items()):
+                labels = f'method="{method}",route="{_escape(route)}"'
+                total = 0
+                for status_code, count in sorted(metrics.requests.items()):
+                    lines.append(f'http_requests_total{{{labels},status="{status_code}"}} {count}')
+                    total += count
+                for bound, count in zip(DURATION_BUCKETS, metrics.buckets):
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {total}')
+                lines.append(f'http_request_duration_seconds_sum{{{labels}}} {metrics.duration_sum:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{{labels}}} {total}')
+                lines.append(f'http_request_sql_queries_total{{{labels}}} {metrics.queries}')
+                lines.append(f'http_request_sql_seconds_total{{{labels}}} {metrics.sql_seconds:.6f}')
+                lines.append(f'http_request_sql_rows_affected_total{{{labels}}} {metrics.rows_affected}')
+                lines.append(f'http_response_bytes_total{{{labels}}} {metrics.response_bytes}')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def render_pool_stats(pools: dict) -> str:
+    """Prometheus gauges for database.pool_stats()."""
+    lines = []
+    for pool, stats in pools.items():
+        for key, value in stats.items():
+            if value is not None:
+                lines.append(f'db_pool_{key}{{pool="{pool}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def route_template(scope) -> str:
+    """Matched route's path template (e.g. /api/quotes/{quote_id}), which keeps label cardinality bounded."""
+    # Routes of an included router only know their path relative to the router; FastAPI
+    # records the full, prefixed path alongside when it matches one
+    effective = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(effective, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or "<unmatched>"
+
+
+class InstrumentationMiddleware:
+    """Pure ASGI middleware, so it adds no task or buffering to streamed responses."""
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope=scope)
+        token = _current_stats.set(stats)
+        started_at = time.perf_counter()
+        status_code = 500
+        response_bytes = 0
+
+        async def send_with_timing(message):
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", stats.server_timing(time.perf_counter() - started_at))
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            registry.observe(scope["method"], route_template(scope), status_code, time.perf_counter() - started_at, stats, response_bytes)
@@ -0,0 +1,31 @@
+"""
+JSON response for plain dict/list payloads that skip response_model validation.
+
+Encodes with orjson when it is installed (dates and datetimes natively, as
+ISO 8601 like Pydantic does); otherwise falls back to the stdlib encoder.
+"""
+import json
+from datetime import date, datetime
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
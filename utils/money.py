@@ -0,0 +1,66 @@
+"""
+Exact money arithmetic.
+
+Amounts are Decimals quantized to cents, matching the Numeric(10, 2) columns.
+Line items are totalled in exact Decimal arithmetic, so a quote's subtotal
+never accumulates float error, and tax is rounded exactly once, half-up, at
+the company's rate.
+"""
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Annotated, Iterable
+from pydantic import AfterValidator, PlainSerializer
+
+CENT = Decimal("0.01")
+RATE_PLACES = Decimal("0.0001")
+DEFAULT_TAX_RATE = Decimal("0.1000")
+
+
+def to_money(value) -> Decimal:
+    # str() first so floats keep their shortest repr instead of binary expansion
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def to_rate(value) -> Decimal:
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return value.quantize(RATE_PLACES, rounding=ROUND_HALF_UP)
+
+
+def line_total(quantity: int, rate) -> Decimal:
+    return to_money(quantity * to_money(rate))
+
+
+@dataclass(frozen=True)
+class Totals:
+    subtotal: Decimal
+    tax: Decimal
+    total: Decimal
+
+
+def calculate_totals(line_items: Iterable, tax_rate: Decimal = DEFAULT_TAX_RATE) -> Totals:
+    """
+    Totals for objects with quantity and rate. Rates coming from Money fields
+    or Numeric(10, 2) columns are already whole cents, so the products are
+    exact and are summed as-is; anything else is quantized first. Tax is
+    rounded once, on the subtotal.
+    """
+    subtotal = sum(
+        (item.quantity * (item.rate if item.rate.__class__ is Decimal else to_money(item.rate)) for item in line_items),
+        Decimal(0)
+    )
+    subtotal = to_money(subtotal)
+    tax = to_money(subtotal * to_rate(tax_rate))
+    return Totals(subtotal=subtotal, tax=tax, total=subtotal + tax)
+
+
+def format_rate(rate: Decimal) -> str:
+    """0.0825 -> '8.25%'"""
+    return f"{(to_rate(rate) * 100).normalize():f}%"
+
+
+# Money fields: validated and held as cent-quantized Decimal, rendered as JSON numbers
+Money = Annotated[Decimal, AfterValidator(to_money), PlainSerializer(float, return_type=float, when_used="json")]
+TaxRate = Annotated[Decimal, AfterValidator(to_rate), PlainSerializer(float, return_type=float, when_used="json")]
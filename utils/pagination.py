@@ -0,0 +1,61 @@
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException, Query, status
+from sqlalchemy import tuple_
+from typing import Optional
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class PageParams:
+    """Keyset pagination parameters shared by the list endpoints."""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = None
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def apply_keyset(query, model, params: PageParams):
+    """
+    Orders newest first on (created_at, id) and seeks past the cursor.
+    Works on both legacy Query objects and select() statements.
+    One extra row is fetched so build_page can tell whether another page exists.
+    """
+    if params.cursor:
+        created_at, row_id = decode_cursor(params.cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(params.limit + 1)
+
+
+def build_page(rows, params: PageParams):
+    rows = list(rows)
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def paginate(query, model, params: PageParams):
+    return build_page(apply_keyset(query, model, params).all(), params)
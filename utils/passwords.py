@@ -0,0 +1,67 @@
+from functools import lru_cache
+from passlib.context import CryptContext
+from config.environment import (
+    password_bcrypt_rounds, password_hash_workers, password_hash_max_pending, password_hash_timeout
+)
+from utils.process_pool import BoundedProcessPool
+
+
+@lru_cache(maxsize=None)
+def _crypt_context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+# Module-level so they can be pickled into worker processes
+def _hash(password: str, rounds: int) -> str:
+    return _crypt_context(rounds).hash(password)
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    return _crypt_context(password_bcrypt_rounds).verify(password, password_hash)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated process pool so hashing never holds the GIL.
+    Request handlers use the *_async methods, which await the result on the
+    event loop and so keep no request threadpool slot busy while bcrypt runs.
+    At most max_pending operations may be queued or running; beyond that
+    callers get a 429. With workers=0 hashing runs in the threadpool instead.
+    """
+
+    def __init__(self, workers: int, max_pending: int, rounds: int, timeout: float):
+        self.rounds = rounds
+        self._pool = BoundedProcessPool(
+            workers=workers,
+            max_pending=max_pending,
+            timeout=timeout,
+            busy_detail="Too many concurrent sign-in attempts, please retry shortly",
+            timeout_detail="Password service timed out, please retry"
+        )
+
+    def hash(self, password: str) -> str:
+        return self._pool.run(_hash, password, self.rounds)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return self._pool.run(_verify, password, password_hash)
+
+    async def hash_async(self, password: str) -> str:
+        return await self._pool.run_async(_hash, password, self.rounds)
+
+    async def verify_async(self, password: str, password_hash: str) -> bool:
+        return await self._pool.run_async(_verify, password, password_hash)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        # Only parses the hash's cost parameter, cheap enough to run inline
+        return _crypt_context(self.rounds).needs_update(password_hash)
+
+    def shutdown(self):
+        self._pool.shutdown()
+
+
+password_hasher = PasswordHasher(
+    workers=password_hash_workers,
+    max_pending=password_hash_max_pending,
+    rounds=password_bcrypt_rounds,
+    timeout=password_hash_timeout
+)
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+
+class BoundedProcessPool:
+    """
+    Lazily started process pool for CPU-bound work that must not hold the GIL.
+    At most max_pending calls may be queued or running; beyond that callers
+    get a 429, and calls that outlive timeout get a 503. With workers=0 calls
+    run inline.
+
+    run() blocks the calling thread until the result is ready, which suits
+    background threads and sync code. Request handlers use run_async(), which
+    awaits the result on the event loop, so a call in flight holds no request
+    threadpool slot.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float, busy_detail: str, timeout_detail: str):
+        self.workers = workers
+        self.timeout = timeout
+        self.busy_detail = busy_detail
+        self.timeout_detail = timeout_detail
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _acquire(self, wait: bool):
+        # Interactive callers fail fast; batch callers (wait=True) queue for a slot up to timeout
+        acquired = self._slots.acquire(timeout=self.timeout) if wait else self._slots.acquire(blocking=False)
+        if not acquired:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=self.busy_detail,
+                headers={"Retry-After": "1"}
+            )
+
+    def _submit(self, fn, *args):
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # Release on completion rather than on return, so timed-out work still counts against the limit
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn, *args, wait: bool = False):
+        self._acquire(wait)
+        if not self.workers:
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+
+        try:
+            return self._submit(fn, *args).result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=self.timeout_detail)
+
+    async def run_async(self, fn, *args):
+        self._acquire(wait=False)
+        if not self.workers:
+            # Inline mode still keeps CPU work off the event loop
+            try:
+                return await run_in_threadpool(fn, *args)
+            finally:
+                self._slots.release()
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(self._submit(fn, *args)), self.timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=self.timeout_detail)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
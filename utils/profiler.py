@@ -0,0 +1,110 @@
+"""
+Opt-in statistical profiler for individual requests.
+
+With PROFILER_ENABLED=true, ProfilerMiddleware profiles a PROFILER_SAMPLE_RATE
+fraction of requests, plus any request carrying `X-Profile: <PROFILER_TOKEN>`.
+While a profiled request runs, a sampler thread reads every thread's stack
+from sys._current_frames() each PROFILER_INTERVAL_MS and counts them. Stacks
+without any FastAPI, Starlette or application frame (idle workers, the event
+loop waiting in select) are dropped.
+
+Samples are appended to PROFILER_DIR/<METHOD>_<route>.folded in collapsed
+stack format ("frame;frame;frame count"), which flamegraph.pl, speedscope and
+inferno read directly; repeated stacks across requests are summed by those tools.
+Only one request is profiled at a time. Requests running concurrently with
+it still appear in its samples, so profile on a quiet instance or read the
+stacks by their controller frames.
+
+bcrypt and PDF rendering run in process pools, so their CPU only shows up when
+PASSWORD_HASH_WORKERS=0 / PDF_RENDER_WORKERS=0 run them in-process.
+"""
+import os
+import random
+import re
+import sys
+import threading
+from collections import Counter
+from config.environment import profiler_sample_rate, profiler_token, profiler_interval_ms, profiler_dir
+from utils.instrumentation import route_template
+
+PROFILE_HEADER = b"x-profile"
+# A stack is kept only if one of its frames belongs to request handling
+REQUEST_MODULES = ("fastapi", "starlette", "controllers", "services", "serializers", "dependencies", "models", "utils", "database", "async_database", "main")
+
+
+def _frame_name(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+def _collapse(frame):
+    names = []
+    in_request = False
+    while frame is not None:
+        name = _frame_name(frame)
+        in_request = in_request or name.split(".", 1)[0].split(":", 1)[0] in REQUEST_MODULES
+        names.append(name)
+        frame = frame.f_back
+    return ";".join(reversed(names)) if in_request else None
+
+
+def profile_path(method: str, route: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", f"{method} {route}").strip("_")
+    return os.path.join(profiler_dir, f"{slug}.folded")
+
+
+class _Sampler(threading.Thread):
+    """Samples all threads until finish(); then appends the collapsed stacks to the route's file."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self.path = None
+        self._done = threading.Event()
+
+    def run(self):
+        own_id = threading.get_ident()
+        while not self._done.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    stack = _collapse(frame)
+                    if stack:
+                        self.stacks[stack] += 1
+        if self.stacks and self.path:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as output:
+                output.writelines(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+    def finish(self, path: str):
+        self.path = path
+        self._done.set()
+
+
+class ProfilerMiddleware:
+    """Pure ASGI; requests that are not sampled pay for one random() and a header scan."""
+
+    def __init__(self, app, sample_rate: float = profiler_sample_rate, token: str = profiler_token):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.token = token.encode() if token else None
+        self._busy = threading.Lock()
+
+    def _wanted(self, scope) -> bool:
+        if self.token is not None and any(
+            name == PROFILE_HEADER and value == self.token for name, value in scope["headers"]
+        ):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = _Sampler(profiler_interval_ms / 1000)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            sampler.finish(profile_path(scope["method"], route_template(scope)))
+            self._busy.release()
@@ -0,0 +1,134 @@
+"""
+Opt-in slow-query log.
+
+With SLOW_QUERY_LOG=true every engine gets cursor event hooks that time each
+statement. Statements slower than SLOW_QUERY_THRESHOLD_MS are written as one
+JSON object per line to SLOW_QUERY_LOG_FILE (rotated by size), with their
+bound parameters and the route and controller function of the request that
+issued them (taken from the instrumentation middleware's request context).
+
+On PostgreSQL a SLOW_QUERY_EXPLAIN_SAMPLE_RATE fraction of slow SELECTs is
+re-run as EXPLAIN (ANALYZE, BUFFERS) on a connection of its own, so a failing
+EXPLAIN can never abort the request's transaction. Those connections come from
+a dedicated NullPool engine with a short connect timeout, never from the
+application pool, so a saturated pool can't stall the request being logged.
+The plan is stored with the entry and the tables read by sequential scan are
+listed in `seq_scans`. EXPLAIN ANALYZE executes the query a second time,
+which is why it is sampled.
+
+Parameters are logged verbatim; keep the log away from production data you
+would not put in a log file.
+"""
+import json
+import logging
+import random
+import re
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from config.environment import (
+    slow_query_threshold_ms, slow_query_explain_sample_rate, slow_query_log_file,
+    slow_query_log_max_bytes, slow_query_log_backups
+)
+from utils.instrumentation import current_stats, route_template
+
+SEQ_SCAN_PATTERN = re.compile(r"Seq Scan on (\S+)")
+MAX_LOGGED_PARAMETER_SETS = 10
+EXPLAIN_CONNECT_TIMEOUT_SECONDS = 2
+
+logger = logging.getLogger("inflow.slow_queries")
+# Application engine -> engine that runs its EXPLAINs
+_explain_engines = {}
+
+
+def _configure_logger():
+    if logger.handlers:
+        return
+    handler = RotatingFileHandler(slow_query_log_file, maxBytes=slow_query_log_max_bytes, backupCount=slow_query_log_backups)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _request_origin():
+    stats = current_stats()
+    scope = stats.scope if stats is not None else None
+    if scope is None:
+        return None, None
+    endpoint = scope.get("endpoint")
+    controller = f"{endpoint.__module__}.{endpoint.__qualname__}" if endpoint is not None else None
+    return f"{scope['method']} {route_template(scope)}", controller
+
+
+def _create_explain_engine(engine):
+    """Unpooled engine on the same database; it has none of the application engine's event hooks."""
+    if engine.dialect.is_async:
+        # Used from inside the AsyncEngine's greenlet, like the sync_engine it shadows
+        return create_async_engine(engine.url, poolclass=NullPool, connect_args={"timeout": EXPLAIN_CONNECT_TIMEOUT_SECONDS}).sync_engine
+    return create_engine(engine.url, poolclass=NullPool, connect_args={"connect_timeout": EXPLAIN_CONNECT_TIMEOUT_SECONDS})
+
+
+def _explain(conn, statement: str, parameters):
+    """EXPLAIN (ANALYZE, BUFFERS) output as a list of lines, on a fresh connection outside any SQLAlchemy events."""
+    raw = _explain_engines[conn.engine].raw_connection()
+    try:
+        cursor = raw.cursor()
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            raw.rollback()
+    finally:
+        raw.close()
+
+
+def _should_explain(conn, statement: str, executemany: bool) -> bool:
+    if executemany or conn.engine not in _explain_engines:
+        return False
+    # Only plain reads: EXPLAIN ANALYZE really executes the statement, and row locks would block on our own transaction
+    head = statement.lstrip()[:6].upper()
+    return head == "SELECT" and "FOR UPDATE" not in statement.upper() and random.random() < slow_query_explain_sample_rate
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - conn.info["slow_query_started_at"].pop()) * 1000
+    if duration_ms < slow_query_threshold_ms:
+        return
+
+    route, controller = _request_origin()
+    entry = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "duration_ms": round(duration_ms, 2),
+        "route": route,
+        "controller": controller,
+        "statement": statement,
+        "parameters": list(parameters[:MAX_LOGGED_PARAMETER_SETS]) if executemany else parameters,
+        "executemany": len(parameters) if executemany else None,
+        "rowcount": cursor.rowcount,
+    }
+    if _should_explain(conn, statement, executemany):
+        try:
+            plan = _explain(conn, statement, parameters)
+            entry["plan"] = plan
+            entry["seq_scans"] = sorted({match.group(1) for line in plan for match in SEQ_SCAN_PATTERN.finditer(line)})
+        except Exception as exc:
+            entry["explain_error"] = repr(exc)
+    logger.info(json.dumps(entry, default=str))
+
+
+def attach(engine):
+    """Log slow statements of an Engine (or an AsyncEngine's sync_engine)."""
+    _configure_logger()
+    if engine.dialect.name == "postgresql":
+        _explain_engines[engine] = _create_explain_engine(engine)
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)